@@ -6,12 +6,37 @@ damage calculations, combat flow, and monster defeat handling.
 
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Optional, Tuple
 
 import ui
-from models import Action, CombatResult, Monster, Player, Weakness
+from models import Action, CombatResult, Monster, Player, TurnResult, Weakness
 from narrative_engine import NarrativeEngine
 
+# Static lookup tables, built once at import time so per-turn lookups do not
+# reconstruct dicts inside the combat loop. Labels are indexed directly by
+# Action value (Action is an IntEnum).
+_ACTION_LABELS_BY_VALUE = tuple(
+    {
+        Action.HOLY_SMITE: "Holy Smite",
+        Action.SWORD_SLASH: "Sword Slash",
+        Action.SHIELD_BASH: "Shield Bash",
+        Action.USE_POTION: "Use Potion",
+        Action.FLEE: "Flee",
+    }.get(value)
+    for value in range(max(Action) + 1)
+)
+
+# Weakness lookup indexed directly by Action value (Action is an IntEnum),
+# replacing dict hashing with a single indexed load
+_WEAKNESS_BY_ACTION = tuple(
+    {
+        Action.HOLY_SMITE: Weakness.HOLY_SMITE,
+        Action.SWORD_SLASH: Weakness.SWORD_SLASH,
+        Action.SHIELD_BASH: Weakness.SHIELD_BASH,
+    }.get(value)
+    for value in range(max(Action) + 1)
+)
+
 
 class CombatEngine:
     """Handles all combat mechanics and calculations.
@@ -21,12 +46,8 @@ class CombatEngine:
     combat flow logic, making it easier to test and modify combat mechanics.
     """
 
-    # Action to weakness mapping (used for combat calculations)
-    ACTION_TO_WEAKNESS = {
-        Action.HOLY_SMITE: Weakness.HOLY_SMITE,
-        Action.SWORD_SLASH: Weakness.SWORD_SLASH,
-        Action.SHIELD_BASH: Weakness.SHIELD_BASH,
-    }
+    # Weakness lookup table indexed by Action value (used for combat calculations)
+    ACTION_TO_WEAKNESS = _WEAKNESS_BY_ACTION
 
     def __init__(self, narrative_engine: NarrativeEngine, random_provider) -> None:
         """Initialize the combat engine.
@@ -38,21 +59,20 @@ class CombatEngine:
         self.narrative_engine = narrative_engine
         self.random_provider = random_provider
 
-    def get_available_actions(self, player: Player) -> List[Action]:
-        """Get list of available combat actions for the player.
+    def get_available_actions(self, player: Player) -> Tuple[Action, ...]:
+        """Get the available combat actions for the player.
 
         Args:
             player: The player to check available actions for
 
         Returns:
-            List of available Action enums
+            Tuple of available Action enums
         """
-        options: List[Action] = list(player.abilities().keys())
+        unlocked = player.ability_actions()
         # Only show potion option if player is injured AND has potions
         if player.health < player.max_health and player.inventory.num_potions > 0:
-            options.append(Action.USE_POTION)
-        options.append(Action.FLEE)
-        return options
+            return (*unlocked, Action.USE_POTION, Action.FLEE)
+        return (*unlocked, Action.FLEE)
 
     def get_action_label(self, action: Action) -> str:
         """Get display label for a combat action.
@@ -63,34 +83,31 @@ class CombatEngine:
         Returns:
             Human-readable action label
         """
-        action_labels = {
-            Action.HOLY_SMITE: "Holy Smite",
-            Action.SWORD_SLASH: "Sword Slash",
-            Action.SHIELD_BASH: "Shield Bash",
-            Action.USE_POTION: "Use Potion",
-            Action.FLEE: "Flee",
-        }
-        return action_labels[action]
-
-    def calculate_player_damage(self, action: Action, player: Player, monster: Monster) -> int:
+        return _ACTION_LABELS_BY_VALUE[action]
+
+    def calculate_player_damage(self, action: Action, player: Player, monster: Monster,
+                                ability_map: Optional[dict] = None) -> int:
         """Calculate damage dealt by player action against monster.
 
         Args:
             action: The action being performed
             player: The player performing the action
             monster: The target monster
+            ability_map: Optional precomputed result of ``player.abilities()``,
+                so hot callers can avoid rebuilding the mapping per call
 
         Returns:
             Final damage amount after weakness bonuses
         """
-        ability_map = player.abilities()
+        if ability_map is None:
+            ability_map = player.abilities()
         dmg_fn = ability_map.get(action)
         if dmg_fn is None:
             return 0
         base = dmg_fn()
         return monster.apply_weakness_bonus(action, base)
 
-    def execute_combat_turn(self, player: Player, monster: Monster, selected_action: Action) -> dict:
+    def execute_combat_turn(self, player: Player, monster: Monster, selected_action: Action) -> TurnResult:
         """Execute a complete combat turn and return results.
 
         Args:
@@ -99,34 +116,30 @@ class CombatEngine:
             selected_action: The action being performed
 
         Returns:
-            Dictionary containing combat turn results:
-            - action_executed: bool
-            - player_damage_dealt: int
-            - monster_died: bool
-            - is_weakness_hit: bool
-            - monster_retaliation_damage: Optional[int]
-            - player_health_after: Optional[int]
+            TurnResult describing what happened during the turn
         """
         # Handle non-damage actions first
         if selected_action == Action.USE_POTION:
             self.narrative_engine.describe_potion_use(player)
-            return {"action_executed": True, "non_damage_action": True}
+            return TurnResult(non_damage_action=True)
 
         elif selected_action == Action.FLEE:
             flee_succeeded = player.attempt_flee(self.random_provider.random)
             self.narrative_engine.describe_flee_attempt(flee_succeeded, monster.name)
-            return {"action_executed": True, "flee_succeeded": flee_succeeded, "non_damage_action": True}
+            return TurnResult(non_damage_action=True, flee_succeeded=flee_succeeded)
 
         # Handle combat actions (Holy Smite, Shield Bash, Sword Slash)
+        # Invoke the ability exactly once and derive the final damage from
+        # that single base roll, so abilities that consume RNG are not
+        # triggered twice per turn
         ability_map = player.abilities()
         base_damage = ability_map[selected_action]()
-        final_damage = self.calculate_player_damage(selected_action, player, monster)
+        final_damage = monster.apply_weakness_bonus(selected_action, base_damage)
 
-        # Check if it's a weakness hit
-        matching_weakness = self.ACTION_TO_WEAKNESS.get(selected_action)
-        is_weakness = (matching_weakness is not None and
-                      matching_weakness in monster.weaknesses and
-                      final_damage > base_damage)
+        # apply_weakness_bonus only ever adds damage, so a raised final
+        # damage is exactly a weakness hit — no need to re-check the
+        # action/weakness mapping here
+        is_weakness = final_damage > base_damage
 
         # Apply player damage
         damage_dealt = monster.take_damage(final_damage)
@@ -140,17 +153,15 @@ class CombatEngine:
             monster_retaliation_damage = player.take_damage(monster_attack_damage, defense=player.get_defense())
             player_health_after = player.health
 
-        return {
-            "action_executed": True,
-            "non_damage_action": False,
-            "player_damage_dealt": damage_dealt,
-            "monster_died": monster_died,
-            "is_weakness_hit": is_weakness,
-            "monster_retaliation_damage": monster_retaliation_damage,
-            "player_health_after": player_health_after,
-            "base_damage": base_damage,
-            "final_damage": final_damage
-        }
+        return TurnResult(
+            player_damage_dealt=damage_dealt,
+            monster_died=monster_died,
+            is_weakness_hit=is_weakness,
+            monster_retaliation_damage=monster_retaliation_damage,
+            player_health_after=player_health_after,
+            base_damage=base_damage,
+            final_damage=final_damage,
+        )
 
     def handle_monster_defeat(self, monster: Monster, player: Player,
                             final_action: Optional[Action] = None,
@@ -194,7 +205,7 @@ class CombatEngine:
         """
         while player.is_alive() and monster.is_alive():
             available_actions = self.get_available_actions(player)
-            action_labels = [self.get_action_label(action) for action in available_actions]
+            action_labels = [_ACTION_LABELS_BY_VALUE[action] for action in available_actions]
             selected_index = ui.prompt_choice("⚔️ In battle, choose your action:", action_labels)
             selected_action = available_actions[selected_index]
 
@@ -202,29 +213,29 @@ class CombatEngine:
             turn_result = self.execute_combat_turn(player, monster, selected_action)
 
             # Handle non-damage actions
-            if turn_result.get("non_damage_action"):
-                if turn_result.get("flee_succeeded"):
+            if turn_result.non_damage_action:
+                if turn_result.flee_succeeded:
                     return CombatResult.player_fled()  # Combat ended - player fled
                 continue  # Continue combat loop for potion use
 
             # Handle damage actions
-            if turn_result["monster_died"]:
+            if turn_result.monster_died:
                 # Monster died - return combat result with defeat details
                 return CombatResult.monster_defeated(
                     monster,
                     selected_action,
-                    turn_result["is_weakness_hit"]
+                    turn_result.is_weakness_hit
                 )
             else:
                 # Monster survived - describe the complete turn (player action + monster retaliation)
                 self.narrative_engine.describe_combat_turn(
                     self.get_action_label(selected_action),
                     monster,
-                    turn_result["player_damage_dealt"],
-                    turn_result["is_weakness_hit"],
+                    turn_result.player_damage_dealt,
+                    turn_result.is_weakness_hit,
                     player,
-                    monster_retaliation_damage=turn_result["monster_retaliation_damage"],
-                    player_health_after=turn_result["player_health_after"]
+                    monster_retaliation_damage=turn_result.monster_retaliation_damage,
+                    player_health_after=turn_result.player_health_after
                 )
 
             # Update UI after each turn if player is still alive
@@ -1,47 +1,28 @@
 """Loot and item drop system for the dungeon crawler game.
 
 This module handles all item generation logic, including drop calculations,
-loot buckets, and unique item tracking.
+drop probability tables, and unique item tracking.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
 from typing import List
 
 import config
-from models import DropResult, Player, WeightedOption
-from utils import RandomProvider, select_weighted_random
-
-@dataclass
-class LootBucket:
-    """Represents a loot category with its drop probability."""
-    category: str  # Will map to DropResult enum values
-    weight: float
-
-    def __post_init__(self) -> None:
-        if self.weight < 0:
-            raise ValueError(f"Weight must be non-negative, got {self.weight}")
-
-    @classmethod
-    def create_buckets(cls, player: 'Player', remaining_armor: List['DropResult']) -> List['LootBucket']:
-        """Factory method to create all loot buckets with proper weights."""
-        # Build base weights from config
-        weight_no_item = config.DROP_WEIGHTS["NO_ITEM"]
-        weight_health_potion = config.DROP_WEIGHTS["HEALTH_POTION"]
-        weight_escape_scroll = config.DROP_WEIGHTS["ESCAPE_SCROLL"]
-        weight_armor = config.DROP_WEIGHTS["ARMOR"] if remaining_armor else 0.0
-
-        # If no armor remains, redistribute armor weight to 'no item'
-        if not remaining_armor:
-            weight_no_item += config.DROP_WEIGHTS["ARMOR"]
-
-        return [
-            cls("NO_ITEM", weight_no_item),
-            cls("HEALTH_POTION", weight_health_potion),
-            cls("ESCAPE_SCROLL", weight_escape_scroll),
-            cls("ARMOR", weight_armor),
-        ]
+from models import UNIQUE_GEAR, DropResult, Player, WeightedOption
+from utils import (
+    RandomProvider,
+    build_cumulative_weights,
+    select_from_cumulative,
+)
+
+# Maps selected bucket labels straight to their DropResult, so the roll path
+# needs no intermediate bucket objects or per-call mapping dicts
+_BUCKET_TO_DROP = {
+    "NO_ITEM": DropResult.NO_ITEM,
+    "HEALTH_POTION": DropResult.HEALTH_POTION,
+    "ESCAPE_SCROLL": DropResult.ESCAPE_SCROLL,
+}
 
 
 class DropCalculator:
@@ -55,7 +36,27 @@ class DropCalculator:
     def __init__(self, random_provider: RandomProvider) -> None:
         self.random_provider = random_provider
         # Track all unique gear that can still drop (shield, sword, and armor pieces)
-        self._remaining_gear: List[DropResult] = list(DropResult.unique_gear())
+        self._remaining_gear: List[DropResult] = list(UNIQUE_GEAR)
+        # Maintained incrementally so roll_item_drop never has to re-filter
+        # _remaining_gear on every roll
+        self._remaining_armor: List[DropResult] = [
+            item for item in self._remaining_gear
+            if item not in (DropResult.SHIELD, DropResult.SWORD)
+        ]
+        # Drop weights only change when armor runs out, so precompute both
+        # cumulative tables once instead of rebuilding bucket objects per roll
+        self._drop_table_with_armor = build_cumulative_weights([
+            WeightedOption("NO_ITEM", config.DROP_WEIGHTS["NO_ITEM"]),
+            WeightedOption("HEALTH_POTION", config.DROP_WEIGHTS["HEALTH_POTION"]),
+            WeightedOption("ESCAPE_SCROLL", config.DROP_WEIGHTS["ESCAPE_SCROLL"]),
+            WeightedOption("ARMOR", config.DROP_WEIGHTS["ARMOR"]),
+        ])
+        # With no armor left, its weight folds into 'no item'
+        self._drop_table_no_armor = build_cumulative_weights([
+            WeightedOption("NO_ITEM", config.DROP_WEIGHTS["NO_ITEM"] + config.DROP_WEIGHTS["ARMOR"]),
+            WeightedOption("HEALTH_POTION", config.DROP_WEIGHTS["HEALTH_POTION"]),
+            WeightedOption("ESCAPE_SCROLL", config.DROP_WEIGHTS["ESCAPE_SCROLL"]),
+        ])
 
     def get_drop_for_monster(self, defeated_count: int, player: Player) -> DropResult:
         """Get the drop for a monster encounter (guaranteed progression items or random drop).
@@ -88,29 +89,22 @@ class DropCalculator:
         Args:
             player: Player instance to check current equipment (for defensive checks)
         """
-        # Check if any gear (armor pieces) remain
-        # Filter _remaining_gear to get only armor pieces (exclude shield and sword)
-        remaining_armor = [item for item in self._remaining_gear if item not in (DropResult.SHIELD, DropResult.SWORD)]
-
-        # Create loot buckets using the factory method
-        loot_buckets = LootBucket.create_buckets(player, remaining_armor)
-
-        # Convert to WeightedOption for selection
-        weighted_options = [WeightedOption(bucket.category, bucket.weight) for bucket in loot_buckets]
-        chosen_bucket = select_weighted_random(weighted_options, self.random_provider)
+        # Armor availability is maintained incrementally as pieces drop
+        remaining_armor = self._remaining_armor
 
-        # Map bucket names to DropResult values
-        bucket_to_drop = {
-            "NO_ITEM": DropResult.NO_ITEM,
-            "HEALTH_POTION": DropResult.HEALTH_POTION,
-            "ESCAPE_SCROLL": DropResult.ESCAPE_SCROLL,
-        }
+        # Select from the cached cumulative table matching armor availability
+        labels, cumulative_weights = (
+            self._drop_table_with_armor if remaining_armor else self._drop_table_no_armor
+        )
+        chosen_bucket = select_from_cumulative(labels, cumulative_weights, self.random_provider)
 
-        if chosen_bucket in bucket_to_drop:
-            return bucket_to_drop[chosen_bucket]
+        drop = _BUCKET_TO_DROP.get(chosen_bucket)
+        if drop is not None:
+            return drop
 
         if chosen_bucket == "ARMOR" and remaining_armor:
             armor_piece = self.random_provider.choice(remaining_armor)
             self._remaining_gear.remove(armor_piece)
+            self._remaining_armor.remove(armor_piece)
             return armor_piece
         return DropResult.NO_ITEM
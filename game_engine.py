@@ -9,6 +9,7 @@ from monster_generator import MonsterGenerator
 from narrative_engine import NarrativeEngine
 import ui
 from models import (
+    ARMOR_PIECES,
     ActionOption,
     DropResult,
     Monster,
@@ -17,7 +18,12 @@ from models import (
     RoomTypeOption,
     WeightedOption,
 )
-from utils import RandomProvider, DefaultRandomProvider, select_weighted_random
+from utils import (
+    RandomProvider,
+    DefaultRandomProvider,
+    build_cumulative_weights,
+    select_from_cumulative,
+)
 
 # Enables the game to use different storytellers (e.g., for testing) without changing the game code
 class StoryTellerProtocol(Protocol):
@@ -54,6 +60,20 @@ class GameEngine:
         self.monster_generator = MonsterGenerator(self.random_provider)
         self.monsters_defeated: int = 0
         self.game_won: bool = False
+        # Room weights never change, so validate them and build the
+        # cumulative table once instead of re-allocating option objects for
+        # every explored room
+        room_options = [
+            RoomTypeOption(RoomType(room_name), room_weight)
+            for room_name, room_weight in config.ROOM_TYPE_WEIGHTS.items()
+        ]
+        # Fixed number of armor pieces to recover, taken from the cached
+        # models constant so _has_all_gear is two flag checks and a compare
+        self._armor_piece_target = len(ARMOR_PIECES)
+        self._room_table = build_cumulative_weights([
+            WeightedOption(room_option.room_type.value, room_option.spawn_weight)
+            for room_option in room_options
+        ])
 
 
     def start_game(self) -> None:
@@ -103,7 +123,10 @@ class GameEngine:
             raise ValueError(f"Invalid selection: {action_choice}")
 
     def _explore_room(self) -> None:
-        ui.print_debug("_explore_room", "monsters_defeated = " + str(self.monsters_defeated))
+        # Gate at the call site so the message string is never built when
+        # debugging is off
+        if config.DEBUG:
+            ui.print_debug("_explore_room", f"monsters_defeated = {self.monsters_defeated}")
         room_type = self._select_random_room_type()
         if room_type == RoomType.EMPTY.value:
             self.narrative_engine.describe_empty_room()
@@ -120,21 +143,8 @@ class GameEngine:
         self.narrative_engine.describe_encounter(self.current_monster, self.player)
 
     def _select_random_room_type(self) -> str:
-        room_type_weights = config.ROOM_TYPE_WEIGHTS
-
-        # Create RoomTypeOption instances
-        room_options = [
-            RoomTypeOption(RoomType(room_name), room_weight)
-            for room_name, room_weight in room_type_weights.items()
-        ]
-
-        # Convert to WeightedOption for selection
-        weighted_options = [
-            WeightedOption(room_option.room_type.value, room_option.spawn_weight)
-            for room_option in room_options
-        ]
-
-        return select_weighted_random(weighted_options, self.random_provider)
+        labels, cumulative_weights = self._room_table
+        return select_from_cumulative(labels, cumulative_weights, self.random_provider)
 
     # =====================
     # Combat
@@ -165,38 +175,35 @@ class GameEngine:
 
 
     def _has_all_gear(self) -> bool:
-        ui.print_debug("_has_all_gear", "player.has_shield = " + str(self.player.has_shield))
-        ui.print_debug("_has_all_gear", "player.has_sword = " + str(self.player.has_sword))
-        ui.print_debug("_has_all_gear", "self.player.owned_armor = " + str(self.player.owned_armor))
         """Check if the player has recovered all their stolen gear."""
-        all_gear = DropResult.unique_gear()
-        if not self.player.has_shield or not self.player.has_sword:
-            return False
-        # Check if player has all 6 armor pieces
-        armor_pieces = [item for item in all_gear if item not in (DropResult.SHIELD, DropResult.SWORD)]
-        return len(self.player.owned_armor) == len(armor_pieces)
+        if config.DEBUG:
+            ui.print_debug("_has_all_gear", f"player.has_shield = {self.player.has_shield}")
+            ui.print_debug("_has_all_gear", f"player.has_sword = {self.player.has_sword}")
+            ui.print_debug("_has_all_gear", f"self.player.owned_armor = {self.player.owned_armor}")
+        return (self.player.has_shield
+                and self.player.has_sword
+                and len(self.player.owned_armor) == self._armor_piece_target)
 
     def _apply_loot(self, drop: DropResult) -> None:
         """Apply loot to player and show unlock messages if needed."""
         if drop == DropResult.NO_ITEM:
             return
 
-        # Handle consumables with a mapping
-        consumable_handlers = {
-            DropResult.HEALTH_POTION: lambda: self.player.inventory.add_potion(),
-            DropResult.ESCAPE_SCROLL: lambda: self.player.inventory.add_escape_scroll(),
-        }
-        if drop in consumable_handlers:
-            consumable_handlers[drop]()
+        # Handle consumables; 'is' compares enum singletons without hashing
+        if drop is DropResult.HEALTH_POTION:
+            self.player.inventory.add_potion()
+            return
+        if drop is DropResult.ESCAPE_SCROLL:
+            self.player.inventory.add_escape_scroll()
             return
 
         # Handle unique ability unlocks
         if drop == DropResult.SHIELD:
-            self.player.has_shield = True
+            self.player.unlock_shield()
             print("Shield Bash unlocked! 🛡️", flush=True)
             return
         if drop == DropResult.SWORD:
-            self.player.has_sword = True
+            self.player.unlock_sword()
             print("Sword Slash unlocked! 🗡️", flush=True)
             return
 
@@ -6,6 +6,18 @@ New OpenAI accounts get free credits ($5-18), and gpt-4o-mini is very affordable
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import importlib.util
+import logging
+import os
+import random
+import shelve
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import cached_property
 from typing import Union, List, Optional
 
 # Handle both package and direct imports
@@ -15,6 +27,551 @@ except ImportError:
     from models import DropResult, Player
 
 
+# Display names per drop, computed once at import — .name.replace().lower()
+# is a constant per enum member, so there is no reason to rebuild it on
+# every narration call
+_DROP_NAME = {
+    member: member.name.replace("_", " ").lower()
+    for member in DropResult
+}
+# Encounter phrasing gives the two weapons an article ("a shield" guarded
+# by the monster, vs. the bare piece name used elsewhere)
+_ENCOUNTER_ITEM_NAME = {
+    **_DROP_NAME,
+    DropResult.SHIELD: "a shield",
+    DropResult.SWORD: "a sword",
+}
+
+# Stolen-gear membership sets, frozen once at import. Narrations check
+# "is this drop the player's gear?" on every loot and encounter event, so
+# the O(1) set lookup replaces scanning the unique_gear tuple each time
+_UNIQUE_GEAR_FROZEN = frozenset(DropResult.unique_gear())
+_ARMOR_PIECES_FROZEN = _UNIQUE_GEAR_FROZEN - {DropResult.SHIELD, DropResult.SWORD}
+_EXPECTED_ARMOR_COUNT = len(_ARMOR_PIECES_FROZEN)
+
+# Frozen base system prompt. Pinned at index 0 of the conversation for
+# the whole session; see history_prefix_hash for how prefix stability is
+# monitored.
+_SYSTEM_PROMPT = "You are a creative writer for a dark fantasy dungeon crawler game. The player is a holy knight/paladin whose gear was stolen by goblin bandits. The items found are the player's own stolen equipment, which was taken from them during an ambush."
+
+# Static instruction blocks for the two most frequent narration calls
+# (encounters and loot finds). These are pinned once at the head of the
+# conversation in __init__ so the request prefix stays byte-identical
+# across calls, letting OpenAI's automatic prompt-prefix cache reuse it;
+# each call then only appends the short dynamic facts (monster, item,
+# player state). Keep these byte-stable — any edit changes the cached
+# prefix for the whole session.
+_ENCOUNTER_INSTRUCTIONS = """When a message starts with "Encounter:", you are a dungeon master describing a scene to players: a holy knight/paladin enters a room and encounters the monster listed in that message.
+
+IMPORTANT: If the item is marked as "player's stolen holy knight gear" (shield, sword, or any armor piece), describe it as the player's own high-quality equipment that was stolen by goblin bandits. Use phrases like "your gleaming shield", "your blessed sword", "your ornate helm", etc. - these are the paladin's own gear, fit for a holy knight. If the item is marked as "regular loot" (potions, scrolls), describe it as something the monster naturally has or has scavenged.
+
+Write a vivid, atmospheric 1-4 sentence description of this encounter scene. Describe the monster naturally as part of the scene, not as a mechanical announcement.
+- Start with the scene/setting (torchlight, shadows, sounds, etc.)
+- Describe the monster as the player would see it
+- If an item is present, weave it naturally into the description
+- Be immersive and atmospheric, like you're telling a story at a tabletop game
+- Do NOT start with "Enemy spotted:" or similar mechanical phrases
+- Write in second person ("you see", "you notice", etc.)
+
+Add emojis appropriately throughout the description to add color and visual interest (e.g., 🕯️ for torchlight, 👹 for monsters, 🛡️ for shields, 🗡️ for swords, 🧪 for potions, 💀 for skeletons, etc.).
+
+Example style (with player's gear):
+"A massive rat startles at your approach, its whiskers twitching above a shallow pile of scavenged debris. Half-buried there is your shield—its radiant crest muted under dust but unmistakably yours. The creature chitters defensively, as if guarding the strange prize it claimed."
+
+Example style (with monster loot):
+"The dim corridor opens into a wider chamber where a skeletal figure stands guard, its hollow eyes fixed on you. In its bony grasp, you notice a small vial of crimson liquid - a health potion, likely scavenged from some unfortunate adventurer."
+
+Write only the description, no quotes or labels."""
+
+_LOOT_INSTRUCTIONS = """When a message starts with "Loot find:", the holy knight/paladin searches a room in the dungeon and finds the item listed in that message.
+
+Write a vivid 1-3 sentence description of finding this item. Describe how it's discovered, its condition, and the player's reaction. Be cinematic and immersive, like a dungeon master narrating a discovery.
+
+Add emojis appropriately throughout the description to add color and visual interest (e.g., 🛡️ for shields, 🗡️ for swords, ⚔️ for weapons, 🧪 for potions, 📜 for scrolls, ✨ for magic items, etc.).
+
+IMPORTANT: If it's the player's stolen gear (shield, sword, armor), describe it as their own equipment (e.g., "your shield", "your sword", "your helm"). If it's regular loot (potions, scrolls), describe it as something found.
+
+Example style (player's gear):
+"You notice a glint of metal in the corner. As you approach, you recognize the familiar shape of your shield, its radiant emblem still visible beneath a layer of grime. Your fingers close around the cool metal, and a sense of purpose returns to you."
+
+Example style (regular loot):
+"Tucked behind a fallen stone, you discover a small vial of crimson liquid. The glass is intact, and the potion within still glimmers with healing magic."
+
+Write only the description, no quotes or labels."""
+
+# Per-call user-message templates. Hoisted to module scope so the hot
+# narration paths do only a small str.format substitution per call, and so
+# the fixed text cannot drift between calls (a stray whitespace edit in an
+# inline f-string would silently break prefix caching).
+_ENCOUNTER_USER_TEMPLATE = """Encounter:
+Monster: {monster_name}
+Description: {monster_description}
+{items_line}
+
+{player_context}"""
+
+_LOOT_USER_TEMPLATE = """Loot find: {item_type}
+{gear_context}
+
+{player_context}"""
+
+_FLEE_INSTRUCTIONS = """When a message starts with "Flee attempt:", a holy knight/paladin attempts to flee from combat. Write a vivid 1-3 sentence description of the attempt to flee, with the outcome given in that message. Be atmospheric and immersive, like a dungeon master narrating escape.
+
+Add emojis appropriately throughout the description to add color and visual interest (e.g., 🏃 for running, 💨 for speed, ⚠️ for danger, etc.).
+
+Example for success: "You break away from the creature, turning and sprinting down the corridor. The monster's snarls fade behind you as you put distance between yourself and danger."
+
+Example for failure: "You try to disengage, but the creature is too quick. Its claws rake across your back as you turn, forcing you back into the fight."
+
+Write only the description, no quotes or labels."""
+
+_FLEE_USER_TEMPLATE = """Flee attempt:
+- Monster: {monster_name}
+- The attempt was {outcome}."""
+
+# Instruction blocks for the remaining narration types, pinned as system
+# messages alongside the ones above. With every instruction block in the
+# shared pinned prefix, the request prefix is byte-identical across ALL
+# narration types (well past the provider's cache-hit threshold), and
+# each call only appends its short dynamic facts.
+_COMBAT_TURN_INSTRUCTIONS = """When a message starts with "Combat turn:", a holy knight/paladin is in combat. Write a vivid 2-4 sentence description of this complete combat exchange. Describe:
+1. The player's action (how they strike, the divine power or weapon, the impact)
+2. The monster's reaction
+3. If the monster survived, describe its counterattack and the player's response
+4. If the monster died, describe its final moments
+
+Be cinematic and immersive, like a dungeon master narrating a complete combat turn. Flow naturally from the player's action to the monster's response (or death).
+
+Add emojis appropriately throughout the description to add color and visual interest (e.g., ⚔️ for combat, 🛡️ for shields, ✨ for magic, 💀 for death, etc.).
+
+IMPORTANT: Only mention equipment (shield, sword, armor) if the player actually has it. If they don't have armor, describe them in simple clothing that might be worn under armor, not armor. If they don't have a shield, they can't raise a shield to block.
+
+Example style (monster survives):
+"You raise your hand, calling upon the Light, and divine radiance blazes forth, striking the creature with searing holy energy. The monster recoils as the sacred power burns through its form, but it quickly recovers and lunges forward with surprising speed. Claws rake across your clothing as you try to dodge, leaving you winded and bleeding."
+
+Example style (monster dies):
+"You raise your hand, fingers outstretched, as the Light gathers around you in a brilliant aura. A surge of divine energy flows through your veins, igniting your spirit with righteous fury. With a thrust of your palm, you unleash a blinding beam of holy power that strikes the giant rat, searing through its matted fur and scorching its flesh. The creature lets out a piercing shriek, its body convulsing under the purifying light, before collapsing to the ground, smoldering and defeated."
+
+Write only the description, no quotes or labels."""
+
+_COMBAT_TURN_USER_TEMPLATE = """Combat turn:
+- Monster: {monster_name}
+- Description: {monster_description}
+
+{player_context}
+
+The player uses: {action}
+Damage dealt: {player_damage}{weakness_text}
+The monster survives and retaliates.
+{retaliation_text}"""
+
+_VICTORY_INSTRUCTIONS = """When a message starts with "Victory:", a holy knight/paladin has just defeated the monster listed in that message with a final blow. Write a vivid 2-4 sentence description that combines BOTH the final attack and the monster's defeat. Describe the attack itself (how the knight strikes), the monster's reaction and final moments, how it falls, and if items are present, how the knight retrieves them. Be cinematic and immersive, like a dungeon master narrating a complete victory scene.
+
+Add emojis appropriately throughout the description to add color and visual interest (e.g., ⚔️ for combat, ✨ for magic, 💀 for death, 🛡️ for shields, 🗡️ for swords, 💎 for treasures, etc.).
+
+IMPORTANT:
+- Include the attack description in the narrative (e.g., "You raise your hand and unleash a blinding beam of holy power...")
+- Only mention equipment (shield, sword, armor) if the player actually has it or is acquiring it
+- If they don't have armor, describe them in simple clothing that might be worn under armor, not armor
+
+Example style:
+"You raise your hand, fingers outstretched, as the Light gathers around you in a brilliant aura. A surge of divine energy flows through your veins, igniting your spirit with righteous fury. With a thrust of your palm, you unleash a blinding beam of holy power that strikes the giant rat, searing through its matted fur and scorching its flesh. The creature lets out a piercing shriek, its body convulsing under the purifying light, before collapsing to the ground, smoldering and defeated. As you step closer, your heart races at the sight of your shield, half-buried beneath the rat's remains; you reach down, fingers trembling with anticipation, and grasp the familiar, cool metal, reclaiming a piece of your lost honor."
+
+Write only the description, no quotes or labels."""
+
+_VICTORY_USER_TEMPLATE = """Victory:
+- Monster: {monster_name}
+- Description: {monster_description}
+{action_text}
+{items_text}
+
+{player_context}"""
+
+_PRAY_INSTRUCTIONS = """When a message starts with "Prayer:", a holy knight/paladin, injured and weary, kneels to pray for restoration.
+
+Write a vivid 1-3 sentence description of the prayer. Describe how the knight kneels, calls upon their god, and feels the divine light heal their wounds. Be atmospheric and immersive, like a dungeon master narrating a moment of faith.
+
+Add emojis appropriately throughout the description to add color and visual interest (e.g., ✨ for divine light, 🙏 for prayer, 💫 for healing, ⚡ for divine power, etc.).
+
+IMPORTANT: Do NOT mention armor, shield, or sword unless the player actually has them. If they don't have armor, describe them in simple clothing that might be worn under armor, not armor.
+
+Example style (when no armor):
+"You drop to one knee on the cold stone, pressing your hands together in prayer. The words of devotion flow from your lips as you call upon the Light. Warm, golden radiance envelops you, and you feel your wounds knitting closed, your strength returning. The divine power courses through you, and you rise, ready to continue your quest."
+
+Write only the description, no quotes or labels."""
+
+_PRAY_USER_TEMPLATE = """Prayer: the knight kneels to pray for restoration.
+
+{player_context}"""
+
+_ALL_GEAR_INSTRUCTIONS = """When a message starts with "All gear recovered:", a holy knight/paladin has just recovered the final piece of their stolen gear. They now have ALL of their equipment back: shield, sword, and all armor pieces.
+
+Write a vivid 2-4 sentence description of this momentous occasion. The knight should feel a surge of hope and determination. They have recovered everything that was stolen from them - their complete holy knight's regalia. Now, only one thing remains: the Heart of Radiance, the sacred relic that the final boss holds. The knight should feel ready for the final confrontation, knowing that with all their gear restored, they can face the ultimate challenge.
+
+Be emotional and triumphant, but also focused on the final goal. This is a turning point in their journey.
+
+Add emojis appropriately throughout the description to add color and visual interest (e.g., ✨ for triumph, 🛡️ for armor, ⚔️ for readiness, 💎 for the relic, 🌟 for hope, etc.).
+
+Example style:
+"You feel the weight of the final piece settle into place, and suddenly, you are whole again. Every piece of your stolen regalia has been reclaimed - your shield, your sword, your helm, your armor. The familiar weight of your complete holy knight's equipment fills you with a sense of purpose you haven't felt since the ambush. You stand tall, fully restored, and your gaze turns toward the deeper darkness where the final boss awaits. The Heart of Radiance calls to you, and you are ready to answer."
+
+Write only the description, no quotes or labels."""
+
+_ALL_GEAR_USER_TEMPLATE = """All gear recovered: the knight reclaims the final piece of their regalia.
+
+{player_context}"""
+
+_POTION_INSTRUCTIONS = """When a message starts with "Potion use:", a holy knight/paladin drinks a health potion during combat or rest.
+
+Write a vivid 1-3 sentence description of drinking the potion. Describe the act of drinking, the taste, and the healing effect. Be atmospheric and immersive, like a dungeon master narrating item use.
+
+Add emojis appropriately throughout the description to add color and visual interest (e.g., 🧪 for potions, ✨ for healing magic, 💚 for health, 💫 for restoration, etc.).
+
+Example style:
+"You uncork the vial and drink the shimmering liquid in one swift motion. The potion tastes of honey and light, spreading warmth through your body. Your wounds close, your breathing steadies, and strength floods back into your limbs."
+
+Write only the description, no quotes or labels."""
+
+_POTION_USER_TEMPLATE = """Potion use: the knight drinks a health potion.
+
+{player_context}"""
+
+_EMPTY_ROOM_INSTRUCTIONS = """When a message starts with "Empty room", a holy knight/paladin enters an empty room of an ancient underground dungeon.
+There are no monsters and no items to collect — only the atmosphere of the space itself.
+
+Write a vivid 1-3 sentence description of this empty room.
+Focus on environmental detail, mood, remnants of bandit activity, and the quiet tension of a place abandoned in haste.
+You may describe old furniture, scattered supplies, broken barricades, makeshift camps, ritual markings, collapsed stonework, or other atmospheric features — but nothing interactable.
+
+Capture the feeling of brief respite mixed with unease, like a dungeon master describing a room between encounters.
+
+Add emojis appropriately throughout the description to add color and visual interest (e.g., 🕯️ for torchlight, 🗝️ for keys, 📜 for scrolls, 🏺 for containers, etc.).
+
+Example style:
+"The corridor opens into a cramped study carved into the stone. A toppled desk lies on its side, its drawers yanked out and emptied long ago. Scraps of parchment litter the floor, torn and trampled by both boot and claw."
+
+Write only the description, with no quotes or labels."""
+
+_EMPTY_ROOM_USER_PROMPT = "Empty room."
+
+# Pre-written flee narrations, served locally most of the time (see
+# _LOCAL_FLEE_PROBABILITY). Flee attempts reduce to a success/failure
+# boolean plus a monster name, so hand-written lines in the game's voice
+# are indistinguishable from generated ones — serving them costs nothing
+# and returns instantly; the occasional API call keeps fresh variants
+# flowing through the response cache.
+_LOCAL_FLEE_SUCCESS = (
+    "You break away and sprint for the corridor, boots pounding the stone as the {monster_name}'s snarls fade behind you. 🏃💨",
+    "Seizing a heartbeat of hesitation, you dart past the {monster_name} and into the dark, its frustrated howl echoing after you. 🏃",
+    "You feint left, pivot right, and slip beyond the {monster_name}'s reach, the shadows swallowing your retreat. 💨",
+    "With a burst of desperate speed you vault the rubble and leave the {monster_name} clawing at empty air. 🏃⚠️",
+    "You back away step by careful step, then turn and run — the {monster_name}'s cries grow distant as the tunnel bends. 💨🕯️",
+)
+_LOCAL_FLEE_FAILURE = (
+    "You turn to run, but the {monster_name} is faster — claws rake across your back and drive you stumbling back into the fight. ⚠️",
+    "Your boot catches on loose stone mid-turn, and the {monster_name} closes the gap before you can recover. 💀",
+    "You lunge for the corridor, but the {monster_name} cuts off your escape, forcing you back with a vicious swipe. ⚠️🏃",
+    "The {monster_name} anticipates your retreat, slamming into you from the side and pinning you in the chamber. 💢",
+    "You make it three strides before the {monster_name} drags you back into the torchlight, snarling. 🕯️⚠️",
+)
+
+# Fraction of flee narrations served from the local templates above; the
+# remainder still hit the API (through the response cache) for variety
+_LOCAL_FLEE_PROBABILITY = 0.7
+
+# Event types worth remembering across the session; frozen at module scope
+# so track_event does a single hash probe instead of rebuilding a set
+# literal on every game log line
+_SIGNIFICANT_EVENTS = frozenset(
+    {"encounter", "victory", "loot", "game_start", "game_victory", "game_over"}
+)
+
+# Cap on stored event text: every tracked event rides along with all later
+# API calls, so an oversized description would be re-billed on each one
+_MAX_EVENT_CHARS = 200
+
+# Evicted history is batched up and folded into a rolling "story so far"
+# message once this many entries have aged out of the window, so long
+# games keep their early arc without paying for it in full every call
+_SUMMARY_BATCH = 16
+
+_SUMMARY_PROMPT = """Summarize these dungeon-crawl events in 3 sentences, keeping only facts that matter for future narration (gear recovered, monsters defeated, the player's condition):
+
+{events}"""
+
+# Health-status sentences per quartile, lowest first. Fixed strings, so
+# narrations index into this tuple instead of rebuilding them per call
+_HEALTH_STATUS = (
+    "The player is critically injured and barely standing, moving with great difficulty.",
+    "The player is badly wounded, moving slowly and with visible pain.",
+    "The player is moderately injured but still capable of fighting.",
+    "The player is in good condition, with only minor wounds.",
+)
+
+# Runtime output-length tuning: once a narration category has this many
+# observed completions, its max_tokens cap is tightened to the largest
+# observation plus headroom. Most narrations run 1-3 sentences, far under
+# the hand-set caps, and a tighter cap bounds the worst case the backend
+# must budget for.
+_TOKEN_STATS_MIN_SAMPLES = 8
+_TOKEN_STATS_WINDOW = 64
+_TOKEN_CAP_HEADROOM = 1.25
+
+# Cap on memoized player-context strings. Health changes nearly every
+# turn, so stale fingerprints are never re-hit; a small window covers the
+# repeat calls within a single turn without accumulating garbage
+_PLAYER_CTX_CACHE_MAX = 8
+
+# Per-method model routing. The short, fixed-structure narrations (a few
+# sentences of loot or flee flavor) do not need the session model's full
+# capability; a smaller tier is several times cheaper per token and about
+# twice as fast. Centralized here so the routing cannot scatter across
+# call sites; methods not listed use self.model.
+_MODEL_BY_METHOD = {
+    "describe_loot_find": "gpt-4.1-nano",
+    "describe_flee": "gpt-4.1-nano",
+}
+
+# Response-cache tuning: keep up to this many variants per prompt, and
+# while a pool is not yet full, occasionally take the API path anyway so
+# the pool keeps growing and hits don't read as verbatim repetition
+_MAX_CACHE_VARIANTS = 5
+_CACHE_GROW_PROBABILITY = 0.3
+
+# Buffered batch requests are flushed once this many accumulate (see
+# enqueue_batch)
+_BATCH_FLUSH_SIZE = 20
+
+# Bound on distinct prompts held in the response cache; least recently
+# used entries are evicted past this, so an unusually varied session
+# cannot grow the cache without limit
+_CACHE_MAX_ENTRIES = 256
+
+# On-disk home for the response cache, so variant pools built in one
+# session (or seeded by Batch pregeneration) survive into the next
+_DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "dungeon_crawler", "llm_cache"
+)
+
+# Optional semantic layer over the response cache: near-duplicate
+# prompts (same flee outcome against similarly described monsters, the
+# same potion at slightly different health) never hit the exact-match
+# cache, but their narratives are interchangeable. With
+# sentence-transformers installed, prompts are embedded and matched by
+# cosine similarity; without it the layer is silently disabled.
+# Availability is probed with find_spec instead of importing: pulling in
+# sentence-transformers (and torch behind it) costs seconds of startup,
+# so the real import is deferred to _embedder's first use.
+try:
+    import numpy as _np
+    _HAS_SEMANTIC_CACHE = importlib.util.find_spec("sentence_transformers") is not None
+except ImportError:
+    _HAS_SEMANTIC_CACHE = False
+
+# Minimum cosine similarity for a semantic cache hit; below this the
+# prompts are treated as genuinely different scenes
+_SEMANTIC_THRESHOLD = 0.87
+
+_EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Token counting for the history budget. tiktoken gives exact counts for
+# the gpt-4o family; it is optional, and the fallback's ~4-chars-per-token
+# approximation is accurate enough for a trim threshold.
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+
+    def _count_tokens(text: str) -> int:
+        return len(_ENCODING.encode(text))
+except ImportError:
+    def _count_tokens(text: str) -> int:
+        return len(text) // 4 + 1
+
+# Endpoint for the raw HTTP fast path (see _call_llm_raw)
+_CHAT_COMPLETIONS_URL = "https://api.openai.com/v1/chat/completions"
+
+# Stop generation at the first paragraph break. Every prompt asks for a
+# single short description, so anything after a blank line is tail text
+# the game never shows — cutting it there saves output tokens and the
+# latency of generating them. max_tokens values are already sized to
+# ~1.2x the observed p95 completion length per method.
+_STOP_SEQUENCES = ["\n\n"]
+
+# orjson serializes/deserializes several times faster than stdlib json;
+# it is optional, so fall back to the stdlib when not installed
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    _json_loads = json.loads
+
+# Substrings that identify an out-of-credits error regardless of which
+# exception class the SDK raises for it
+_QUOTA_MARKERS = ("insufficient_quota",)
+
+# Transient failures worth retrying, identified by exception class name so
+# the check does not force the openai import. Quota-exhausted errors are
+# excluded separately (_is_retryable) — retrying those just burns time.
+_RETRYABLE_ERROR_NAMES = frozenset({
+    "APITimeoutError",
+    "APIConnectionError",
+    "RateLimitError",
+    "InternalServerError",
+})
+_MAX_CALL_ATTEMPTS = 5
+_RETRY_BASE_DELAY = 0.5
+_RETRY_JITTER = 0.25
+
+
+def _is_retryable(e: Exception) -> bool:
+    """Return True for transient errors that a short backoff may clear.
+
+    Rate-limit errors count only when they are genuine throttling, not
+    quota exhaustion — the latter never clears on its own and is handled
+    terminally by _handle_openai_error.
+    """
+    if type(e).__name__ not in _RETRYABLE_ERROR_NAMES:
+        return False
+    error_str = str(e).lower()
+    return not any(marker in error_str for marker in _QUOTA_MARKERS)
+
+# Failed API calls log a single warning line by default; full tracebacks
+# walk the frame stack and serialize on the terminal, which under async
+# fan-out with partial failures blocks the event loop. Set
+# STORYTELLER_DEBUG=1 to get the full traceback back.
+_logger = logging.getLogger(__name__)
+_DEBUG = os.environ.get("STORYTELLER_DEBUG") == "1"
+
+
+# Opt-in corpus collection for fine-tuning: point this env var at a file
+# and every completed call appends one JSONL line in the chat fine-tune
+# format. Once enough pairs are collected, a model tuned on them can
+# replace the worked examples embedded in every prompt (~100-300 tokens
+# each), cutting input tokens per call. The fine-tune job itself is
+# submitted offline, not from the game.
+_TRAINING_LOG_PATH = os.environ.get("STORYTELLER_TRAINING_LOG")
+
+
+def _log_training_pair(messages: List[dict], response: str) -> None:
+    """Append a (conversation, response) pair to the training corpus file."""
+    if not _TRAINING_LOG_PATH:
+        return
+    try:
+        with open(_TRAINING_LOG_PATH, "ab") as f:
+            f.write(_json_dumps(
+                {"messages": [*messages, {"role": "assistant", "content": response}]}
+            ) + b"\n")
+    except OSError:
+        # Corpus collection must never break a narration
+        pass
+
+
+def _log_cached_tokens(usage) -> None:
+    """Debug-log how much of the prompt hit the provider's prefix cache.
+
+    The pinned instruction prefix only pays off if the provider actually
+    reuses it; a cached_tokens count stuck at zero means the prefix has
+    drifted between calls and needs fixing. Gated on _DEBUG so the happy
+    path never touches the usage payload.
+
+    Args:
+        usage: The response usage object (SDK model) or dict (raw path),
+            or None when the provider omitted it
+    """
+    try:
+        if isinstance(usage, dict):
+            prompt_tokens = usage.get("prompt_tokens")
+            cached = usage.get("prompt_tokens_details", {}).get("cached_tokens")
+        else:
+            prompt_tokens = usage.prompt_tokens
+            cached = usage.prompt_tokens_details.cached_tokens
+        _logger.debug("prompt tokens: %s (cached: %s)", prompt_tokens, cached)
+    except AttributeError:
+        _logger.debug("prompt cache usage details not reported")
+
+
+def _log_llm_failure(e: Exception) -> None:
+    """Record a failed API call: one warning line, traceback only in debug."""
+    if _DEBUG:
+        _logger.exception("LLM API call failed")
+    else:
+        _logger.warning("LLM API call failed: %s: %s", type(e).__name__, e)
+
+
+def _import_openai():
+    """Import the OpenAI SDK on demand, with the usual install hint.
+
+    Deferred to first client use so that merely constructing the
+    storyteller does not pay the openai/httpx/pydantic import cost.
+
+    Returns:
+        (httpx, OpenAI, AsyncOpenAI) for the client builders
+
+    Raises:
+        ImportError: If the openai package is not installed
+    """
+    try:
+        import httpx
+        from openai import OpenAI, AsyncOpenAI
+    except ImportError:
+        raise ImportError(
+            "openai package not installed. Install with: pip install openai"
+        )
+    return httpx, OpenAI, AsyncOpenAI
+
+
+def _build_http_client(httpx, client_cls):
+    """Build a pooled httpx (sync or async) client for the OpenAI SDK.
+
+    Keep-alive connections skip TCP/TLS setup (~100-300 ms) on every call
+    after the first, and HTTP/2 multiplexes concurrent narrations over a
+    single socket. HTTP/2 needs the optional 'h2' extra; fall back to
+    HTTP/1.1 without it.
+
+    Args:
+        httpx: The imported httpx module
+        client_cls: httpx.Client or httpx.AsyncClient
+    """
+    limits = httpx.Limits(max_connections=20, max_keepalive_connections=20)
+    try:
+        return client_cls(http2=True, timeout=30.0, limits=limits)
+    except ImportError:
+        return client_cls(timeout=30.0, limits=limits)
+
+
+def _handle_openai_error(e: Exception) -> None:
+    """Check if an exception is a quota/rate limit error and exit if so.
+
+    Shared by the sync and async call paths so the quota handling cannot
+    drift between them.
+
+    Args:
+        e: The exception to check
+    """
+    error_str = str(e).lower()
+    error_type = type(e).__name__
+    if (any(marker in error_str for marker in _QUOTA_MARKERS) or
+        (error_type == "RateLimitError" and "quota" in error_str) or
+        ("429" in error_str and "quota" in error_str)):
+        print("\n" + "="*60)
+        print("Error: OpenAI API quota exceeded.")
+        print("="*60)
+        print("Your OpenAI account has run out of credits.")
+        print("Please check your account billing and add credits:")
+        print("  https://platform.openai.com/account/billing")
+        print("="*60)
+        sys.exit(1)
+
+
 class LLMStoryTeller:
     """StoryTeller using OpenAI's API to generate creative item descriptions.
 
@@ -22,110 +579,1241 @@ class LLMStoryTeller:
     what has happened previously.
     """
 
-    def __init__(self, api_key: str | None = None, model: str = "gpt-4o-mini"):
+    # SDK clients shared across instances, keyed by (api_key, kind). Each
+    # client owns an httpx connection pool, and a fresh pool pays a full
+    # TCP/TLS handshake (~100-300 ms) on its first call — on game restarts
+    # or multiple storytellers this cold start repeats for no reason.
+    # Reusing the client keeps the keep-alive sockets warm.
+    _shared_clients: dict = {}
+
+    def __init__(self, api_key: str | None = None, model: str = "gpt-4o-mini",
+                 use_responses_api: bool = False,
+                 cache_path: str | None = None,
+                 stream: bool = False):
         """Initialize with OpenAI API key.
 
+        The OpenAI SDK is imported and the API clients are built lazily on
+        first use (see the client/aclient properties), so constructing the
+        storyteller costs nothing if no narration is ever requested.
+
         Args:
             api_key: OpenAI API key. If None, reads from OPENAI_API_KEY env var.
             model: Model to use. Default "gpt-4o-mini" is cheap and fast.
                     Other options: "gpt-4" (better quality), "gpt-3.5-turbo" (faster)
+            use_responses_api: Route narrations through the Responses API,
+                which takes the pinned instruction blocks as a dedicated
+                instructions field instead of system messages (see
+                _call_llm_responses). Off by default: the chat-completions
+                path keeps the raw HTTP fast path and Predicted Outputs.
+            cache_path: Where to persist the response cache between
+                sessions. Defaults to a per-user location under
+                ~/.cache/dungeon_crawler.
+            stream: Render combat and encounter narrations to stdout
+                token by token as they arrive, instead of returning only
+                the finished text. The display layer must expect this
+                (see NarrativeEngine.describe_and_narrate).
+        """
+        self._api_key = api_key
+        self._use_responses_api = use_responses_api
+        # Public so the display layer can tell whether narrations render
+        # themselves (and skip its own panel repaint)
+        self.stream_output = stream
+        # Serializes conversation-history appends from concurrent narrations
+        # so interleaved awaits cannot corrupt the shared history list.
+        self._history_lock = asyncio.Lock()
+        # Caps async fan-out so a large generate_concurrently batch cannot
+        # trip the account's requests-per-minute limit; 8 in flight keeps
+        # well under the default tier limits while still overlapping RTTs.
+        self._concurrency_limit = asyncio.Semaphore(8)
+        self.model = model
+        # Maintain conversation history for the game session. The static
+        # instruction blocks for the hot narration paths are pinned here
+        # once so every request shares an identical prefix (see the module
+        # constants above for why that matters for prompt caching).
+        self.conversation_history: List[dict] = [
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "system", "content": _ENCOUNTER_INSTRUCTIONS},
+            {"role": "system", "content": _LOOT_INSTRUCTIONS},
+            {"role": "system", "content": _COMBAT_TURN_INSTRUCTIONS},
+            {"role": "system", "content": _VICTORY_INSTRUCTIONS},
+            {"role": "system", "content": _PRAY_INSTRUCTIONS},
+            {"role": "system", "content": _ALL_GEAR_INSTRUCTIONS},
+            {"role": "system", "content": _POTION_INSTRUCTIONS},
+            {"role": "system", "content": _EMPTY_ROOM_INSTRUCTIONS},
+            {"role": "system", "content": _FLEE_INSTRUCTIONS},
+        ]
+        # Sliding window over the non-pinned history. Without a cap, every
+        # narration and tracked event grows the message list forever, and the
+        # whole list is re-sent (and billed) on every API call. Keep the
+        # pinned system prefix plus the most recent entries; evict the
+        # oldest entry past the window.
+        self._pinned_history_len = len(self.conversation_history)
+        self._max_history = 24
+        # Token budget for the non-pinned history. Counting tokens per
+        # entry (instead of relying on entry count alone) makes the input
+        # bill per call deterministic even when individual narrations run
+        # long. Parallel to conversation_history[_pinned_history_len:].
+        self._history_token_budget = 1500
+        self._history_token_counts: List[int] = []
+        self._history_token_sum = 0
+        # Entries evicted from the window, awaiting summarization into a
+        # rolling "story so far" message (see _fold_evicted_into_summary)
+        self._evicted_log: List[str] = []
+        self._summarizing = False
+        # Whether the window currently starts with the rolling summary
+        # entry. The summary lives in a dedicated slot right after the
+        # pinned prefix and is replaced in place on each fold, so trimming
+        # never evicts it.
+        self._has_summary = False
+        # Equipment context sentences keyed by gear state (shield, sword,
+        # armor tuple). The gear state changes only on pickups, so the
+        # handful of distinct sentences per game is rebuilt once each.
+        self._equipment_text_cache: dict = {}
+        # Full player-context strings keyed by (health, gear) fingerprint,
+        # so a combat turn and its victory narration share one build
+        self._player_ctx_cache: dict = {}
+        # Buffered Batch API requests and their completed results (see
+        # enqueue_batch / get_batch_result)
+        self._batch_buffer: List[bytes] = []
+        self._batch_results: dict = {}
+        # Sync single-flight map: identical narrations started from two
+        # threads share one API call (see _generate_narrative). Events
+        # carry their result/error as attributes set before .set()
+        self._sync_inflight: dict = {}
+        self._sync_inflight_lock = threading.Lock()
+        # Observed completion lengths per narration category, and the caps
+        # tuned from them (see _tuned_max_tokens / _record_output_tokens)
+        self._token_stats: dict = {}
+        self._max_tokens_by_label: dict = {}
+        # In-flight async narrations keyed by their full request tuple, so
+        # identical requests that race coalesce onto one API call (see
+        # _agenerate_narrative)
+        self._inflight: dict = {}
+        # Last victory narration per (monster, item) bucket, fed back as a
+        # Predicted Output on the next victory in the same bucket: the
+        # scaffold ("the X falls... you retrieve your Y...") is largely
+        # stable, so matching tokens are validated instead of sampled and
+        # time-to-last-token drops.
+        self._victory_priors: dict = {}
+        # Response cache for repeatable narrations, keyed by the rendered
+        # prompt (which captures everything the text depends on: item,
+        # gear context, player state). Each key holds a small pool of
+        # variants so cache hits don't read as verbatim repetition; see
+        # _cached_narrative. Ordered so eviction past _CACHE_MAX_ENTRIES
+        # drops the least recently used prompt, and warmed from disk so
+        # pools built in earlier sessions carry over.
+        self._response_cache: OrderedDict = OrderedDict()
+        self._cache_path = cache_path or _DEFAULT_CACHE_PATH
+        self._load_response_cache()
+        # Semantic cache index per narration category: parallel lists of
+        # normalized prompt embeddings and their cached responses. Kept
+        # per category so a flee narration can never answer a prayer
+        # prompt, however similar the wording.
+        self._semantic_index: dict = {}
+
+    @classmethod
+    def close_clients(cls) -> None:
+        """Close the shared connection pools, e.g. at process shutdown.
+
+        The pools are class-level so instances can reuse warm keep-alive
+        sockets; that also means no single instance owns them, so cleanup
+        is explicit. Best-effort: a pool that fails to close is dropped
+        anyway, and the next storyteller simply rebuilds it.
+        """
+        for shared in cls._shared_clients.values():
+            close = getattr(shared, "close", None)
+            if close is None:
+                continue
+            try:
+                result = close()
+                # AsyncOpenAI.close() is a coroutine; drive it if no loop
+                # is running, otherwise let interpreter teardown reap it
+                if asyncio.iscoroutine(result):
+                    try:
+                        asyncio.get_running_loop()
+                        result.close()
+                    except RuntimeError:
+                        asyncio.run(result)
+            except Exception:
+                pass
+        cls._shared_clients.clear()
+
+    @cached_property
+    def client(self):
+        """Sync OpenAI client, constructed lazily on first narration.
+
+        Importing the openai package (plus httpx/pydantic) and building the
+        client costs tens of milliseconds at startup; deferring it means a
+        storyteller that never narrates never pays it. Shared across
+        instances per api_key (see _shared_clients).
+        """
+        key = (self._api_key, "sync")
+        client = self._shared_clients.get(key)
+        if client is None:
+            httpx, OpenAI, _ = _import_openai()
+            # Retries live in _call_llm's own backoff loop, which knows the
+            # quota-vs-throttle distinction; stacking SDK retries on top
+            # would multiply the worst-case wait. The 30 s transport
+            # timeout caps how long any single attempt can stall the game.
+            client = self._shared_clients[key] = OpenAI(
+                api_key=self._api_key,
+                http_client=_build_http_client(httpx, httpx.Client),
+                max_retries=0,
+            )
+        return client
+
+    @cached_property
+    def aclient(self):
+        """Async OpenAI client for batch narration, constructed lazily.
+
+        Several independent narrations (e.g. multiple loot finds) can
+        overlap their network round trips instead of paying one full round
+        trip each, serially. Shared across instances per api_key (see
+        _shared_clients).
+        """
+        key = (self._api_key, "async")
+        client = self._shared_clients.get(key)
+        if client is None:
+            httpx, _, AsyncOpenAI = _import_openai()
+            client = self._shared_clients[key] = AsyncOpenAI(
+                api_key=self._api_key,
+                http_client=_build_http_client(httpx, httpx.AsyncClient),
+                max_retries=3,
+            )
+        return client
+
+    @cached_property
+    def aclient_alt(self):
+        """Second async client with its own connection pool, for racing.
+
+        Built on a distinct httpx.AsyncClient so its TCP connections never
+        share a socket with aclient's — a raced duplicate request that
+        rode the same connection would just queue behind the original and
+        defeat the point (see _acall_llm_race).
+        """
+        key = (self._api_key, "async-alt")
+        client = self._shared_clients.get(key)
+        if client is None:
+            httpx, _, AsyncOpenAI = _import_openai()
+            client = self._shared_clients[key] = AsyncOpenAI(
+                api_key=self._api_key,
+                http_client=_build_http_client(httpx, httpx.AsyncClient),
+                max_retries=3,
+            )
+        return client
+
+    @cached_property
+    def _raw_session(self) -> "object":
+        """Pooled httpx client for the raw HTTP fast path.
+
+        Posting the payload dict directly skips the SDK's per-message
+        Pydantic validation and model construction, which adds measurable
+        CPU per call on long histories. Shared across instances per
+        api_key (see _shared_clients).
+        """
+        key = (self._api_key, "raw")
+        session = self._shared_clients.get(key)
+        if session is None:
+            import httpx
+
+            session = self._shared_clients[key] = _build_http_client(httpx, httpx.Client)
+            api_key = self._api_key or os.environ.get("OPENAI_API_KEY", "")
+            session.headers.update({
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            })
+        return session
+
+    def _call_llm_raw(self, messages: List[dict], max_tokens: int, temperature: float = 0.8,
+                      model_override: Optional[str] = None,
+                      prediction: Optional[str] = None) -> str:
+        """Raw-HTTP counterpart of _call_llm, bypassing SDK validation.
+
+        Posts the request payload straight to the chat-completions endpoint
+        and parses only the content field out of the response. Any failure
+        falls back to the SDK path, which owns retries, quota detection,
+        and error reporting.
+
+        Args:
+            messages: List of message dicts for the API call
+            max_tokens: Maximum tokens for the response
+            temperature: Temperature for the API call (default 0.8)
+            model_override: Model to use for this call instead of self.model
+            prediction: Likely completion text, sent as a Predicted Output
+                so matching tokens are validated instead of sampled
+
+        Returns:
+            The response content as a string
+        """
+        try:
+            payload = {
+                "model": model_override or self.model,
+                "messages": messages,
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                "stop": _STOP_SEQUENCES,
+            }
+            if prediction:
+                payload["prediction"] = {"type": "content", "content": prediction}
+            response = self._raw_session.post(
+                _CHAT_COMPLETIONS_URL,
+                content=_json_dumps(payload),
+            )
+            if response.status_code != 200:
+                raise ValueError(f"HTTP {response.status_code}: {response.text}")
+            data = _json_loads(response.content)
+            if _DEBUG:
+                _log_cached_tokens(data.get("usage"))
+            choice = data["choices"][0]
+            if choice.get("finish_reason") == "length":
+                print("[WARNING] Response truncated due to token limit (finish_reason: length)", flush=True)
+            content = choice["message"]["content"]
+            if content is None:
+                raise ValueError("LLM returned None content")
+            content = content.strip()
+            _log_training_pair(messages, content)
+            return content
+        except Exception:
+            # The SDK path retries transient failures and reports quota
+            # errors; let it handle anything the fast path could not.
+            # The prediction is a latency hint only, so it is not worth
+            # threading through the fallback.
+            return self._call_llm(messages, max_tokens, temperature, model_override=model_override)
+
+    def _call_llm_responses(self, messages: List[dict], max_tokens: int, temperature: float = 0.8,
+                            model_override: Optional[str] = None) -> str:
+        """Responses API counterpart of _call_llm (opt-in, see __init__).
+
+        Splits the leading system messages — the pinned instruction
+        prefix — into the API's dedicated instructions field, which the
+        provider caches server-side with stronger guarantees than the
+        chat-completions prefix heuristic, and sends only the dynamic
+        window as input.
+
+        Args:
+            messages: List of message dicts for the API call
+            max_tokens: Maximum tokens for the response
+            temperature: Temperature for the API call (default 0.8)
+            model_override: Model to use for this call instead of self.model
+
+        Returns:
+            The response content as a string
+
+        Raises:
+            Exception: Re-raises any non-quota errors
+        """
+        split = 0
+        while split < len(messages) and messages[split]["role"] == "system":
+            split += 1
+        try:
+            response = self.client.responses.create(
+                model=model_override or self.model,
+                instructions="\n\n".join(m["content"] for m in messages[:split]),
+                input=messages[split:],
+                max_output_tokens=max_tokens,
+                temperature=temperature,
+            )
+            content = response.output_text
+            if not content:
+                raise ValueError("LLM returned empty content")
+            content = content.strip()
+            _log_training_pair(messages, content)
+            return content
+        except Exception as e:
+            _log_llm_failure(e)
+            _handle_openai_error(e)
+            raise
+
+    def _fold_evicted_into_summary(self) -> None:
+        """Compress evicted history into a rolling 'story so far' message.
+
+        One cheap low-temperature call condenses the batch of aged-out
+        entries (plus the previous summary, so nothing ages out of the
+        arc entirely) into three sentences kept in a dedicated slot right
+        after the pinned prefix, so long games keep their early arc at a
+        fraction of the original token cost. Best-effort: on failure the
+        batch is simply dropped, which is the pre-summary behavior.
+        """
+        events = self._evicted_log
+        if self._has_summary:
+            # Carry the previous summary forward so the new one covers the
+            # whole evicted arc, not just the latest batch
+            events = [self.conversation_history[self._pinned_history_len]["content"]] + events
+        self._summarizing = True
+        try:
+            summary = self._call_llm([
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": _SUMMARY_PROMPT.format(events="\n".join(events))},
+            ], max_tokens=120, temperature=0.3)
+        except Exception:
+            return
+        finally:
+            self._summarizing = False
+            self._evicted_log.clear()
+        content = f"Story so far: {summary}"
+        tokens = _count_tokens(content)
+        if self._has_summary:
+            # Replace in place: the window carries exactly one summary and
+            # trimming never touches its slot
+            self.conversation_history[self._pinned_history_len] = {"role": "assistant", "content": content}
+            self._history_token_sum += tokens - self._history_token_counts[0]
+            self._history_token_counts[0] = tokens
+        else:
+            self.conversation_history.insert(self._pinned_history_len, {"role": "assistant", "content": content})
+            self._history_token_counts.insert(0, tokens)
+            self._history_token_sum += tokens
+            self._has_summary = True
+
+    def _cached_narrative(self, prompt: str, max_tokens: int, history_label: str,
+                          model_override: Optional[str] = None) -> str:
+        """Variant-cached wrapper around _generate_narrative.
+
+        Flavor text at temperature > 0 is interchangeable between calls
+        with identical inputs, so repeat prompts are served from a small
+        pool of previously generated variants (picked at random) instead
+        of paying another API round trip. While a pool is below
+        _MAX_CACHE_VARIANTS, a fraction of hits still call the API to
+        grow it.
+
+        Args:
+            prompt: The fully rendered prompt (also the cache key)
+            max_tokens: Maximum tokens for the response
+            history_label: Label for the conversation history entry
+            model_override: Model to use for this call instead of self.model
+
+        Returns:
+            A narrative description for the prompt
+        """
+        variants = self._response_cache.get(prompt)
+        if variants and (len(variants) >= _MAX_CACHE_VARIANTS
+                         or random.random() >= _CACHE_GROW_PROBABILITY):
+            self._response_cache.move_to_end(prompt)
+            description = random.choice(variants)
+            # Cache-served narrations still happened in the story: record
+            # them so later calls keep continuity with what the player read
+            self._append_history(f"{history_label}: {description}")
+            return description
+
+        # On an exact miss, a near-duplicate prompt in the same category
+        # (see _semantic_lookup) is close enough to reuse
+        semantic_hit, vector = self._semantic_lookup(history_label, prompt)
+        if semantic_hit is not None:
+            self._append_history(f"{history_label}: {semantic_hit}")
+            return semantic_hit
+
+        description = self._generate_narrative(prompt, max_tokens, history_label,
+                                               model_override=model_override)
+        self._store_cached_response(prompt, description)
+        self._semantic_store(history_label, vector, description)
+        return description
+
+    @cached_property
+    def _embedder(self):
+        """Sentence-embedding model for the semantic cache, or None.
+
+        Loaded lazily on the first cacheable narration so sessions that
+        never need it (or environments without sentence-transformers)
+        pay nothing — the heavyweight import happens here too, not at
+        module load (see the availability probe above _HAS_SEMANTIC_CACHE).
+        """
+        if not _HAS_SEMANTIC_CACHE:
+            return None
+        try:
+            from sentence_transformers import SentenceTransformer
+            return SentenceTransformer(_EMBEDDING_MODEL_NAME)
+        except Exception:
+            # Model download/load failure disables the layer for the session
+            return None
+
+    def _semantic_lookup(self, category: str, prompt: str):
+        """Look up a near-duplicate prompt's cached response.
+
+        Args:
+            category: Narration category; matches never cross categories
+            prompt: The rendered prompt to match
+
+        Returns:
+            (response, embedding) on data available — response is None on
+            a miss — or (None, None) when the layer is disabled
+        """
+        if self._embedder is None:
+            return None, None
+        vector = self._embedder.encode(prompt, normalize_embeddings=True)
+        vectors, responses = self._semantic_index.get(category, ((), ()))
+        if len(vectors) == 0:
+            return None, vector
+        similarities = _np.stack(vectors) @ vector
+        best = int(similarities.argmax())
+        if similarities[best] >= _SEMANTIC_THRESHOLD:
+            return responses[best], vector
+        return None, vector
+
+    def _semantic_store(self, category: str, vector, description: str) -> None:
+        """Index a freshly generated response under its prompt embedding."""
+        if vector is None:
+            return
+        vectors, responses = self._semantic_index.setdefault(category, ([], []))
+        vectors.append(vector)
+        responses.append(description)
+
+    def _store_cached_response(self, prompt: str, description: str) -> None:
+        """Record a generated variant in the response cache and on disk."""
+        pool = self._response_cache.setdefault(prompt, [])
+        pool.append(description)
+        self._response_cache.move_to_end(prompt)
+        while len(self._response_cache) > _CACHE_MAX_ENTRIES:
+            self._response_cache.popitem(last=False)
+        self._persist_cache_entry(prompt, pool)
+
+    def _load_response_cache(self) -> None:
+        """Warm the response cache from the on-disk store, best-effort."""
+        try:
+            os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+            with shelve.open(self._cache_path) as db:
+                for key in db:
+                    self._response_cache[key] = db[key]
+        except Exception:
+            # A missing or corrupt store just means starting cold
+            pass
+
+    def _persist_cache_entry(self, prompt: str, variants: List[str]) -> None:
+        """Write one variant pool through to the on-disk store, best-effort."""
+        try:
+            with shelve.open(self._cache_path) as db:
+                db[prompt] = variants
+        except Exception:
+            # Persistence must never break a narration
+            pass
+
+    def history_prefix_hash(self) -> str:
+        """Digest of the pinned system prefix, for cache-hit monitoring.
+
+        The provider's prompt-prefix cache only hits while this prefix is
+        byte-identical between calls. Log this value alongside API calls
+        and cross-reference usage.prompt_tokens_details.cached_tokens to
+        catch refactors that silently break cache hits.
+
+        Returns:
+            Hex blake2b digest of the pinned prefix contents
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for message in self.conversation_history[:self._pinned_history_len]:
+            digest.update(message["content"].encode())
+        return digest.hexdigest()
+
+    def _append_history(self, content: str) -> None:
+        """Record an assistant entry and enforce the history bounds.
+
+        Tracks the entry's token count alongside it so trimming can work
+        against a real token budget rather than entry count alone.
+        """
+        self.conversation_history.append({"role": "assistant", "content": content})
+        tokens = _count_tokens(content)
+        self._history_token_counts.append(tokens)
+        self._history_token_sum += tokens
+        self._trim_history()
+
+    def _trim_history(self) -> None:
+        """Evict the oldest non-pinned history entries past the bounds.
+
+        Evicts while the window holds more than _max_history entries or
+        (keeping at least the newest entry) its token sum exceeds
+        _history_token_budget. The system prefix (index 0 ..
+        _pinned_history_len - 1) is never evicted: it carries the game
+        premise and the cached instruction blocks, and removing or
+        reordering it would break prompt-prefix caching for the rest of
+        the session. The rolling summary slot, when present, is likewise
+        skipped — it exists precisely to outlive the window.
+        """
+        counts = self._history_token_counts
+        # Offset past the summary slot so neither the entry cap nor the
+        # token budget counts it against the sliding window
+        skip = 1 if self._has_summary else 0
+        while (len(counts) > self._max_history + skip or
+               (len(counts) > 1 + skip and self._history_token_sum > self._history_token_budget)):
+            evicted = self.conversation_history.pop(self._pinned_history_len + skip)
+            self._history_token_sum -= counts.pop(skip)
+            self._evicted_log.append(evicted["content"])
+        if len(self._evicted_log) >= _SUMMARY_BATCH and not self._summarizing:
+            # The fold is a blocking sync call with retry backoff. The
+            # async path reaches this trim under _history_lock inside the
+            # running event loop (_agenerate_uncoalesced), where blocking
+            # would stall every other in-flight narration — defer there.
+            # The batch stays in _evicted_log, so the next sync-path trim
+            # (the game loop's ordinary narrations) folds it instead.
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                self._fold_evicted_into_summary()
+        # Eviction must never disturb the pinned prefix: losing or
+        # reordering the system messages would silently break prompt-prefix
+        # caching for every later call
+        assert self.conversation_history[0]["content"] is _SYSTEM_PROMPT, (
+            "system message must stay pinned at index 0"
+        )
+
+    def _call_llm(self, messages: List[dict], max_tokens: int, temperature: float = 0.8,
+                  model_override: Optional[str] = None) -> str:
+        """Make an LLM API call and return the response content.
+
+        Args:
+            messages: List of message dicts for the API call
+            max_tokens: Maximum tokens for the response
+            temperature: Temperature for the API call (default 0.8)
+            model_override: Model to use for this call instead of self.model
+                (e.g., a cheaper tier for low-stakes narrations)
+
+        Transient failures (timeouts, dropped connections, genuine 429
+        throttling, 5xx) are retried up to _MAX_CALL_ATTEMPTS times with
+        exponential backoff plus jitter — the jitter keeps simultaneous
+        retries from re-colliding on the same tick. Narrative calls are
+        idempotent, so retrying is always safe. Quota exhaustion is
+        terminal and exits via _handle_openai_error as before.
+
+        Returns:
+            The response content as a string
+
+        Raises:
+            Exception: Re-raises any non-quota errors
+        """
+        for attempt in range(_MAX_CALL_ATTEMPTS):
+            try:
+                response = self.client.chat.completions.create(
+                    model=model_override or self.model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stop=_STOP_SEQUENCES,
+                )
+                if _DEBUG:
+                    _log_cached_tokens(response.usage)
+                # Check if response was truncated due to token limit
+                choice = response.choices[0]
+                finish_reason = choice.finish_reason
+                if finish_reason == "length":
+                    print(f"[WARNING] Response truncated due to token limit (finish_reason: {finish_reason})", flush=True)
+                content = choice.message.content
+                if content is None:
+                    raise ValueError("LLM returned None content")
+                content = content.strip()
+                _log_training_pair(messages, content)
+                return content
+            except Exception as e:
+                if attempt < _MAX_CALL_ATTEMPTS - 1 and _is_retryable(e):
+                    time.sleep((2 ** attempt) * _RETRY_BASE_DELAY +
+                               random.uniform(0, _RETRY_JITTER))
+                    continue
+                _log_llm_failure(e)
+                _handle_openai_error(e)
+                # Re-raise other errors
+                raise
+
+    def _generate_narrative(self, prompt: str, max_tokens: int, history_label: str,
+                            model_override: Optional[str] = None,
+                            prediction: Optional[str] = None) -> str:
+        """Generate a narrative description using the LLM and update conversation history.
+
+        Sync counterpart of the single-flight map in _agenerate_narrative:
+        if another thread (e.g. a background pregeneration) is already
+        running the identical request, wait on its event and share the
+        result instead of billing a duplicate API call.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            max_tokens: Maximum tokens for the response
+            history_label: Label for the conversation history entry (e.g., "Combat turn (Holy Smite)")
+            model_override: Model to use for this call instead of self.model
+            prediction: Likely completion text for Predicted Outputs (see
+                _call_llm_raw)
+
+        Returns:
+            The generated narrative description
+        """
+        key = (prompt, max_tokens, history_label, model_override)
+        with self._sync_inflight_lock:
+            event = self._sync_inflight.get(key)
+            if event is None:
+                event = self._sync_inflight[key] = threading.Event()
+                is_leader = True
+            else:
+                is_leader = False
+        if not is_leader:
+            event.wait()
+            if event.error is not None:
+                raise event.error
+            return event.result
+        try:
+            event.result = self._generate_uncoalesced(prompt, max_tokens, history_label,
+                                                      model_override, prediction)
+            event.error = None
+            return event.result
+        except Exception as e:
+            event.error = e
+            raise
+        finally:
+            with self._sync_inflight_lock:
+                self._sync_inflight.pop(key, None)
+            event.set()
+
+    def _generate_uncoalesced(self, prompt: str, max_tokens: int, history_label: str,
+                              model_override: Optional[str] = None,
+                              prediction: Optional[str] = None) -> str:
+        """The actual sync generation path behind the single-flight map."""
+        max_tokens = self._tuned_max_tokens(history_label, max_tokens)
+        # Single-allocation snapshot, same as the async path: sync
+        # narrations can run concurrently from background threads (that is
+        # the single-flight map's premise), and mutating the shared list
+        # in place would leak a scratch user message into any payload or
+        # async snapshot built while this call is in flight. The copy is
+        # O(window) on an already-bounded list.
+        messages = [*self.conversation_history, {"role": "user", "content": prompt}]
+        if self._use_responses_api:
+            # The prediction hint is a chat-completions feature; dropped here
+            description = self._call_llm_responses(messages, max_tokens,
+                                                   model_override=model_override)
+        else:
+            description = self._call_llm_raw(messages, max_tokens,
+                                             model_override=model_override,
+                                             prediction=prediction)
+        self._record_output_tokens(history_label, description)
+        self._append_history(f"{history_label}: {description}")
+        return description
+
+    @staticmethod
+    def _label_category(history_label: str) -> str:
+        """Reduce a history label to its narration category.
+
+        Labels carry dynamic detail ("Encounter with Goblin", "Combat turn
+        (Holy Smite)"); the output-length statistics only make sense per
+        narration type, so strip everything after the fixed stem.
+        """
+        return history_label.split(" with ")[0].split(" (")[0]
+
+    def _tuned_max_tokens(self, history_label: str, max_tokens: int) -> int:
+        """Return the tuned cap for this narration category, if one exists.
+
+        The tuned cap only ever tightens the hand-set budget — raising it
+        could let a rambling completion past the per-method design limit.
+        """
+        tuned = self._max_tokens_by_label.get(self._label_category(history_label))
+        if tuned is not None and tuned < max_tokens:
+            return tuned
+        return max_tokens
+
+    def _record_output_tokens(self, history_label: str, description: str) -> None:
+        """Fold a completed narration's length into the per-category stats.
+
+        Once a category has _TOKEN_STATS_MIN_SAMPLES observations, its cap
+        is retuned to the largest recent observation plus headroom; the
+        sample window is bounded so a one-off outlier ages out.
+        """
+        category = self._label_category(history_label)
+        stats = self._token_stats.setdefault(category, [])
+        stats.append(_count_tokens(description))
+        if len(stats) > _TOKEN_STATS_WINDOW:
+            del stats[0]
+        if len(stats) >= _TOKEN_STATS_MIN_SAMPLES:
+            self._max_tokens_by_label[category] = int(max(stats) * _TOKEN_CAP_HEADROOM)
+
+    async def _acall_llm(self, messages: List[dict], max_tokens: int, temperature: float = 0.8,
+                         model_override: Optional[str] = None, race: bool = False) -> str:
+        """Async counterpart of _call_llm using the AsyncOpenAI client.
+
+        Args:
+            messages: List of message dicts for the API call
+            max_tokens: Maximum tokens for the response
+            temperature: Temperature for the API call (default 0.8)
+            model_override: Model to use for this call instead of self.model
+            race: When True, fire the request twice on independent
+                connections and keep whichever answers first (see
+                _acall_llm_race). Reserve for interactive, user-facing
+                narrations — it doubles the request count.
+
+        Returns:
+            The response content as a string
+
+        Raises:
+            Exception: Re-raises any non-quota errors
+        """
+        try:
+            async with self._concurrency_limit:
+                if race:
+                    response = await self._acall_llm_race(messages, max_tokens, temperature,
+                                                          model_override)
+                else:
+                    response = await self.aclient.chat.completions.create(
+                        model=model_override or self.model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        stop=_STOP_SEQUENCES,
+                    )
+            choice = response.choices[0]
+            finish_reason = choice.finish_reason
+            if finish_reason == "length":
+                print(f"[WARNING] Response truncated due to token limit (finish_reason: {finish_reason})", flush=True)
+            content = choice.message.content
+            if content is None:
+                raise ValueError("LLM returned None content")
+            content = content.strip()
+            _log_training_pair(messages, content)
+            return content
+        except Exception as e:
+            _log_llm_failure(e)
+            _handle_openai_error(e)
+            raise
+
+    async def _acall_llm_race(self, messages: List[dict], max_tokens: int,
+                              temperature: float = 0.8,
+                              model_override: Optional[str] = None):
+        """Issue the same request on two independent connections, first wins.
+
+        Occasional slow responses (a cold backend, a retried packet) sit
+        far out on the provider's tail; duplicating the request across two
+        TCP connections leaves the median latency alone but cuts the P95
+        roughly to the faster of two draws. The loser is cancelled as soon
+        as the winner lands so it stops consuming a connection.
+
+        Returns:
+            The raw completion response from whichever client finished
+            first
+
+        Raises:
+            Exception: The first completed task's exception, if both the
+                winner failed and no other task succeeded
+        """
+        request_kwargs = dict(
+            model=model_override or self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stop=_STOP_SEQUENCES,
+        )
+        tasks = [
+            asyncio.ensure_future(self.aclient.chat.completions.create(**request_kwargs)),
+            asyncio.ensure_future(self.aclient_alt.chat.completions.create(**request_kwargs)),
+        ]
+        try:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        # Drain every task before returning: the cancelled loser's
+        # CancelledError must be consumed, and when both land in the same
+        # tick the loser's exception would otherwise surface at GC as
+        # "Task exception was never retrieved"
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Prefer any success; otherwise surface a finished task's error
+        # (never the cancellation injected into the loser)
+        first_error = None
+        for task, result in zip(tasks, results):
+            if not isinstance(result, BaseException):
+                return result
+            if task in done and first_error is None:
+                first_error = result
+        raise first_error
+
+    async def _agenerate_narrative(self, prompt: str, max_tokens: int, history_label: str,
+                                   model_override: Optional[str] = None,
+                                   race: bool = False) -> str:
+        """Async counterpart of _generate_narrative for concurrent narrations.
+
+        Identical requests that race (same prompt already in flight, e.g.
+        duplicated loot finds in one batch) are coalesced onto a single
+        API call: the duplicates await the first call's task and share its
+        result, so only one request is billed and only one history entry
+        is recorded.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            max_tokens: Maximum tokens for the response
+            history_label: Label for the conversation history entry
+            model_override: Model to use for this call instead of self.model
+
+        Returns:
+            The generated narrative description
+        """
+        key = (prompt, max_tokens, history_label, model_override)
+        task = self._inflight.get(key)
+        if task is not None:
+            return await task
+        task = asyncio.ensure_future(
+            self._agenerate_uncoalesced(prompt, max_tokens, history_label, model_override,
+                                        race=race)
+        )
+        self._inflight[key] = task
+        try:
+            return await task
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _agenerate_uncoalesced(self, prompt: str, max_tokens: int, history_label: str,
+                                     model_override: Optional[str] = None,
+                                     race: bool = False) -> str:
+        """The actual async generation path behind the single-flight map.
+
+        The conversation history is snapshotted before the request and only
+        appended to under a lock afterwards, so several narrations awaited
+        concurrently (see generate_concurrently) cannot interleave partial
+        history updates.
+        """
+        max_tokens = self._tuned_max_tokens(history_label, max_tokens)
+        # Single-allocation snapshot; no separate copy-then-append pass
+        messages = [*self.conversation_history, {"role": "user", "content": prompt}]
+
+        description = await self._acall_llm(messages, max_tokens, model_override=model_override,
+                                            race=race)
+        async with self._history_lock:
+            self._record_output_tokens(history_label, description)
+            self._append_history(f"{history_label}: {description}")
+        return description
+
+    async def generate_concurrently(self, requests: List[tuple]) -> List[str]:
+        """Generate several independent narrations with overlapping round trips.
+
+        Useful when multiple narrations are needed for one scene (e.g. several
+        loot finds): N sequential calls cost N network round trips, while this
+        costs roughly one.
+
+        Args:
+            requests: List of (prompt, max_tokens, history_label) tuples, each
+                as accepted by _agenerate_narrative
+
+        Returns:
+            List of generated descriptions, in request order
+        """
+        return list(await asyncio.gather(*(
+            self._agenerate_narrative(prompt, max_tokens, history_label)
+            for prompt, max_tokens, history_label in requests
+        )))
+
+    def save(self, path: str) -> None:
+        """Persist the session's dynamic history to disk for warm restart.
+
+        Only the window past the pinned prefix is written: the prefix is
+        rebuilt from the module constants on load, which guarantees it
+        stays byte-identical across sessions — that identity is what lets
+        the provider's prompt-prefix cache hit on the resumed session's
+        first call instead of reprocessing the instructions cold.
+
+        Args:
+            path: File to write the JSON session state to
+        """
+        state = {
+            "model": self.model,
+            "has_summary": self._has_summary,
+            "history": self.conversation_history[self._pinned_history_len:],
+        }
+        with open(path, "wb") as f:
+            f.write(_json_dumps(state))
+
+    @classmethod
+    def load(cls, path: str, api_key: str | None = None) -> "LLMStoryTeller":
+        """Reconstruct a storyteller from a saved session.
+
+        Args:
+            path: File written by save
+            api_key: OpenAI API key. If None, reads from OPENAI_API_KEY env var.
+
+        Returns:
+            A storyteller whose conversation history continues the saved
+            session
+        """
+        with open(path, "rb") as f:
+            state = _json_loads(f.read())
+        storyteller = cls(api_key=api_key, model=state.get("model", "gpt-4o-mini"))
+        storyteller._has_summary = state.get("has_summary", False)
+        for entry in state.get("history", []):
+            storyteller.conversation_history.append(entry)
+            tokens = _count_tokens(entry["content"])
+            storyteller._history_token_counts.append(tokens)
+            storyteller._history_token_sum += tokens
+        # Saved state from an older version may exceed the current bounds
+        storyteller._trim_history()
+        return storyteller
+
+    def pregenerate_narrations(self, monster_names: List[str],
+                               variants_per_prompt: int = _MAX_CACHE_VARIANTS,
+                               poll_interval: float = 60.0) -> int:
+        """Pregenerate repeatable narrations via the OpenAI Batch API.
+
+        The flee narrations are fully determined by monster name and
+        outcome, so the whole (monster x outcome x variant) product is
+        known up front. Submitting it as one batch job costs half the
+        normal token price, and every in-game flee then resolves from the
+        variant cache with zero API latency.
+
+        The Batch API's completion window is 24 hours, so this is meant to
+        run ahead of a play session (e.g. overnight), not on the
+        interactive path. Best-effort: on any failure the cache is simply
+        left unseeded and narrations fall back to live calls.
+
+        Args:
+            monster_names: Monster names to cover (see MonsterGenerator)
+            variants_per_prompt: Variants requested per prompt, so cache
+                hits don't read as verbatim repetition
+            poll_interval: Seconds between batch status polls
+
+        Returns:
+            Number of narrations loaded into the response cache
+        """
+        prefix = self.conversation_history[:self._pinned_history_len]
+        prompts: List[str] = []
+        for monster_name in monster_names:
+            for success in (True, False):
+                prompts.append(_FLEE_USER_TEMPLATE.format(
+                    monster_name=monster_name,
+                    outcome="successful" if success else "unsuccessful",
+                ))
+
+        lines = []
+        for prompt_index, prompt in enumerate(prompts):
+            for variant in range(variants_per_prompt):
+                lines.append(_json_dumps({
+                    "custom_id": f"{prompt_index}-{variant}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.model,
+                        "messages": [*prefix, {"role": "user", "content": prompt}],
+                        "max_tokens": 120,
+                        "temperature": 0.8,
+                    },
+                }))
+
+        try:
+            results = self._submit_batch_and_wait(lines, poll_interval)
+            loaded = 0
+            for custom_id, content in results.items():
+                prompt_index = int(custom_id.split("-")[0])
+                pool = self._response_cache.setdefault(prompts[prompt_index], [])
+                if len(pool) < _MAX_CACHE_VARIANTS:
+                    pool.append(content)
+                    loaded += 1
+            # Persist the seeded pools so the overnight batch run benefits
+            # every later session, not just this process
+            for prompt in prompts:
+                pool = self._response_cache.get(prompt)
+                if pool:
+                    self._persist_cache_entry(prompt, pool)
+            return loaded
+        except Exception as e:
+            print(f"[WARNING] Batch pregeneration failed: {type(e).__name__}: {e}", flush=True)
+            return 0
+
+    def _submit_batch_and_wait(self, lines: List[bytes], poll_interval: float = 60.0) -> dict:
+        """Submit JSONL request lines as one Batch API job and collect results.
+
+        Blocks, polling until the batch reaches a terminal state; the
+        Batch API's completion window is 24 hours, so callers run this
+        off the interactive path.
+
+        Args:
+            lines: Serialized batch request records (with custom_id set)
+            poll_interval: Seconds between batch status polls
+
+        Returns:
+            Mapping of custom_id to stripped response content for every
+            request that produced a usable completion; empty if the batch
+            failed or expired
+        """
+        batch_file = self.client.files.create(
+            file=("narration_batch.jsonl", b"\n".join(lines)),
+            purpose="batch",
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+        if batch.status != "completed":
+            return {}
+
+        results: dict = {}
+        output = self.client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            result = _json_loads(line)
+            body = result.get("response", {}).get("body", {})
+            choices = body.get("choices")
+            if not choices:
+                continue
+            content = choices[0]["message"]["content"]
+            if content:
+                results[result["custom_id"]] = content.strip()
+        return results
+
+    def enqueue_batch(self, prompt_id: str, messages: List[dict], max_tokens: int) -> None:
+        """Buffer a non-urgent narration request for discounted batch submission.
+
+        Narrations the game can anticipate (upcoming rooms, gear-recovery
+        scenes) don't need sub-second latency; buffering them and
+        submitting via the Batch API costs half the normal token price.
+        Once the buffer reaches _BATCH_FLUSH_SIZE it is flushed on a
+        background thread; call flush_batch() directly at a known-safe
+        moment to submit a partial buffer.
+
+        Args:
+            prompt_id: Caller's key for fetching the result later (see
+                get_batch_result)
+            messages: Full message list for the chat-completions request
+            max_tokens: Maximum tokens for the response
         """
+        self._batch_buffer.append(_json_dumps({
+            "custom_id": prompt_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": self.model,
+                "messages": messages,
+                "max_tokens": max_tokens,
+                "temperature": 0.8,
+            },
+        }))
+        if len(self._batch_buffer) >= _BATCH_FLUSH_SIZE:
+            self.flush_batch()
+
+    def flush_batch(self) -> None:
+        """Submit the buffered batch requests on a background thread."""
+        if not self._batch_buffer:
+            return
+        lines, self._batch_buffer = self._batch_buffer, []
+        worker = threading.Thread(target=self._run_batch, args=(lines,), daemon=True)
+        worker.start()
+
+    def _run_batch(self, lines: List[bytes]) -> None:
+        """Background worker: run one batch job and record its results."""
         try:
-            from openai import OpenAI
-        except ImportError:
-            raise ImportError(
-                "openai package not installed. Install with: pip install openai"
-            )
+            self._batch_results.update(self._submit_batch_and_wait(lines))
+        except Exception as e:
+            _log_llm_failure(e)
 
-        self.client = OpenAI(api_key=api_key)
-        self.model = model
-        # Maintain conversation history for the game session
-        self.conversation_history: List[dict] = [
-            {
-                "role": "system",
-                "content": "You are a creative writer for a dark fantasy dungeon crawler game. The player is a holy knight/paladin whose gear was stolen by goblin bandits. The items found are the player's own stolen equipment, which was taken from them during an ambush."
-            }
-        ]
+    def get_batch_result(self, prompt_id: str) -> Optional[str]:
+        """Fetch a completed batch narration, or None if not (yet) available.
 
-    def _check_quota_error(self, e: Exception) -> None:
-        """Check if an exception is a quota/rate limit error and exit if so.
+        Call sites use this as a pre-check and fall back to a live call
+        on a miss.
+        """
+        return self._batch_results.get(prompt_id)
 
-        Args:
-            e: The exception to check
-        """
-        error_str = str(e).lower()
-        error_type = type(e).__name__
-        if ("insufficient_quota" in error_str or
-            (error_type == "RateLimitError" and "quota" in error_str) or
-            ("429" in error_str and "quota" in error_str)):
-            print("\n" + "="*60)
-            print("Error: OpenAI API quota exceeded.")
-            print("="*60)
-            print("Your OpenAI account has run out of credits.")
-            print("Please check your account billing and add credits:")
-            print("  https://platform.openai.com/account/billing")
-            print("="*60)
-            import sys
-            sys.exit(1)
-
-    def _call_llm(self, messages: List[dict], max_tokens: int, temperature: float = 0.8) -> str:
-        """Make an LLM API call and return the response content.
+    def _stream_llm(self, messages: List[dict], max_tokens: int, temperature: float = 0.8):
+        """Make a streaming LLM API call, yielding text deltas as they arrive.
+
+        Streaming lets the caller start rendering the narrative at
+        time-to-first-token instead of stalling until the full completion
+        has been generated.
 
         Args:
             messages: List of message dicts for the API call
             max_tokens: Maximum tokens for the response
             temperature: Temperature for the API call (default 0.8)
 
-        Returns:
-            The response content as a string
+        Transient failures are retried with the same backoff schedule as
+        _call_llm — the shared sync client is built with max_retries=0 on
+        the premise that the callers own retries, and without this loop a
+        single dropped connection would abort the narration (and, via the
+        engine's error handling, the session). Retrying is only safe
+        before the first delta has been yielded; once the caller has
+        rendered text, a retry would duplicate it, so mid-stream failures
+        propagate.
+
+        Yields:
+            Response content fragments, in order
 
         Raises:
             Exception: Re-raises any non-quota errors
         """
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=temperature,
-            )
-            # Check if response was truncated due to token limit
-            finish_reason = response.choices[0].finish_reason
-            if finish_reason == "length":
-                print(f"[WARNING] Response truncated due to token limit (finish_reason: {finish_reason})", flush=True)
-            content = response.choices[0].message.content
-            if content is None:
-                raise ValueError("LLM returned None content")
-            return content.strip()
-        except Exception as e:
-            # Print error for debugging
-            print(f"\n[ERROR] LLM API call failed: {type(e).__name__}: {e}", flush=True)
-            import traceback
-            traceback.print_exc()
-            self._check_quota_error(e)
-            # Re-raise other errors
-            raise
+        for attempt in range(_MAX_CALL_ATTEMPTS):
+            yielded = False
+            try:
+                stream = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stop=_STOP_SEQUENCES,
+                    stream=True,
+                )
+                for chunk in stream:
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yielded = True
+                        yield delta
+                return
+            except Exception as e:
+                if (not yielded and attempt < _MAX_CALL_ATTEMPTS - 1
+                        and _is_retryable(e)):
+                    time.sleep((2 ** attempt) * _RETRY_BASE_DELAY +
+                               random.uniform(0, _RETRY_JITTER))
+                    continue
+                _log_llm_failure(e)
+                _handle_openai_error(e)
+                raise
+
+    def stream_narrative(self, prompt: str, max_tokens: int, history_label: str):
+        """Streaming counterpart of _generate_narrative.
+
+        Yields narrative fragments as they arrive; once the stream is
+        exhausted, the assembled description is recorded in the
+        conversation history exactly as the non-streaming path does.
 
-    def _generate_narrative(self, prompt: str, max_tokens: int, history_label: str) -> str:
-        """Generate a narrative description using the LLM and update conversation history.
+        Args:
+            prompt: The prompt to send to the LLM
+            max_tokens: Maximum tokens for the response
+            history_label: Label for the conversation history entry
+
+        Yields:
+            Narrative text fragments, in order
+        """
+        max_tokens = self._tuned_max_tokens(history_label, max_tokens)
+        # Single-allocation snapshot; no separate copy-then-append pass
+        messages = [*self.conversation_history, {"role": "user", "content": prompt}]
+
+        fragments: List[str] = []
+        for delta in self._stream_llm(messages, max_tokens):
+            fragments.append(delta)
+            yield delta
+
+        description = "".join(fragments).strip()
+        _log_training_pair(messages, description)
+        self._record_output_tokens(history_label, description)
+        self._append_history(f"{history_label}: {description}")
+
+    def collect_narrative(self, prompt: str, max_tokens: int, history_label: str) -> str:
+        """Drain stream_narrative and return the full description string.
+
+        For callers that want the streaming transport (lower time to first
+        byte) but a plain-string interface.
+        """
+        return "".join(self.stream_narrative(prompt, max_tokens, history_label)).strip()
+
+    def _stream_to_stdout(self, prompt: str, max_tokens: int, history_label: str) -> str:
+        """Drain stream_narrative, echoing each fragment to stdout as it arrives.
+
+        Printing tokens the moment they land hides most of the generation
+        wall time behind perceived progress: the player starts reading at
+        time-to-first-token instead of staring at a blank screen for the
+        full completion. Costs nothing extra — same request, same tokens.
 
         Args:
             prompt: The prompt to send to the LLM
             max_tokens: Maximum tokens for the response
-            history_label: Label for the conversation history entry (e.g., "Combat turn (Holy Smite)")
+            history_label: Label for the conversation history entry
 
         Returns:
-            The generated narrative description
+            The full assembled description, for tracking and history
         """
-        messages = self.conversation_history.copy()
-        messages.append({"role": "user", "content": prompt})
-
-        description = self._call_llm(messages, max_tokens)
-        self.conversation_history.append({
-            "role": "assistant",
-            "content": f"{history_label}: {description}"
-        })
-        return description
+        fragments: List[str] = []
+        for delta in self.stream_narrative(prompt, max_tokens, history_label):
+            sys.stdout.write(delta)
+            sys.stdout.flush()
+            fragments.append(delta)
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+        return "".join(fragments).strip()
 
     def track_event(self, event_type: str, description: str) -> None:
         """Add a game event to the conversation history so the LLM remembers it.
@@ -135,12 +1823,14 @@ class LLMStoryTeller:
             description: Description of what happened
         """
         # Only track significant events (skip status updates, etc.)
-        significant_events = {"encounter", "victory", "loot", "game_start", "game_victory", "game_over"}
-        if event_type in significant_events:
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": f"{event_type}: {description}"
-            })
+        if event_type not in _SIGNIFICANT_EVENTS:
+            return
+        content = f"{event_type}: {description[:_MAX_EVENT_CHARS]}"
+        # Adjacent identical events (e.g. repeated drops of the same loot)
+        # would add tokens to every future prompt without adding information
+        if self.conversation_history[-1]["content"] == content:
+            return
+        self._append_history(content)
 
     def describe_combat_turn(
         self,
@@ -151,7 +1841,8 @@ class LLMStoryTeller:
         is_weakness: bool,
         player: Player,
         monster_retaliation_damage: Optional[int] = None,
-        player_health_after: Optional[int] = None
+        player_health_after: Optional[int] = None,
+        stream: Optional[bool] = None
     ) -> str:
         """Generate narrative description of a complete combat turn (player action + monster response).
 
@@ -164,44 +1855,77 @@ class LLMStoryTeller:
             player: The player object
             monster_retaliation_damage: Damage dealt by monster's retaliation (None if monster died)
             player_health_after: Player's health after monster's attack (None if monster died)
+            stream: When True, print tokens to stdout as they arrive instead
+                of blocking until the full completion is generated;
+                defaults to the constructor's stream flag
         """
-        player_context = self._get_player_context(player)
-        weakness_text = " The creature is particularly vulnerable to this attack!" if is_weakness else ""
-
-        retaliation_text = f"\n\nAfter the attack, the {monster_name} retaliates, dealing {monster_retaliation_damage} damage. The player's remaining health is {player_health_after}."
-
-        prompt = f"""A holy knight/paladin is in combat with:
-- Monster: {monster_name}
-- Description: {monster_description}
-
-{player_context}
-
-The player uses: {action}
-Damage dealt: {player_damage}{weakness_text}
-The monster survives and retaliates.
-{retaliation_text}
-
-Write a vivid 2-4 sentence description of this complete combat exchange. Describe:
-1. The player's action (how they strike, the divine power or weapon, the impact)
-2. The monster's reaction
-3. If the monster survived, describe its counterattack and the player's response
-4. If the monster died, describe its final moments
-
-Be cinematic and immersive, like a dungeon master narrating a complete combat turn. Flow naturally from the player's action to the monster's response (or death).
+        if stream is None:
+            stream = self.stream_output
+        prompt = self._build_combat_turn_prompt(
+            action, monster_name, monster_description, player_damage,
+            is_weakness, player, monster_retaliation_damage, player_health_after,
+        )
 
-Add emojis appropriately throughout the description to add color and visual interest (e.g., ⚔️ for combat, 🛡️ for shields, ✨ for magic, 💀 for death, etc.).
+        history_label = f"Combat turn ({action})"
+        if stream:
+            return self._stream_to_stdout(prompt, max_tokens=220, history_label=history_label)
+        return self._generate_narrative(prompt, max_tokens=220, history_label=history_label)
 
-IMPORTANT: Only mention equipment (shield, sword, armor) if the player actually has it. If they don't have armor, describe them in simple clothing that might be worn under armor, not armor. If they don't have a shield, they can't raise a shield to block.
+    def stream_combat_turn(
+        self,
+        action: str,
+        monster_name: str,
+        monster_description: str,
+        player_damage: int,
+        is_weakness: bool,
+        player: Player,
+        monster_retaliation_damage: Optional[int] = None,
+        player_health_after: Optional[int] = None
+    ):
+        """Streaming counterpart of describe_combat_turn.
+
+        Combat turns are the longest narrations in the game, so they gain
+        the most from rendering at time-to-first-token instead of stalling
+        for the full completion. Yields text fragments; the assembled
+        description is recorded in history at stream end, exactly as the
+        non-streaming path does.
+        """
+        prompt = self._build_combat_turn_prompt(
+            action, monster_name, monster_description, player_damage,
+            is_weakness, player, monster_retaliation_damage, player_health_after,
+        )
 
-Example style (monster survives):
-"You raise your hand, calling upon the Light, and divine radiance blazes forth, striking the creature with searing holy energy. The monster recoils as the sacred power burns through its form, but it quickly recovers and lunges forward with surprising speed. Claws rake across your clothing as you try to dodge, leaving you winded and bleeding."
+        return self.stream_narrative(prompt, max_tokens=220, history_label=f"Combat turn ({action})")
 
-Example style (monster dies):
-"You raise your hand, fingers outstretched, as the Light gathers around you in a brilliant aura. A surge of divine energy flows through your veins, igniting your spirit with righteous fury. With a thrust of your palm, you unleash a blinding beam of holy power that strikes the giant rat, searing through its matted fur and scorching its flesh. The creature lets out a piercing shriek, its body convulsing under the purifying light, before collapsing to the ground, smoldering and defeated."
+    def _build_combat_turn_prompt(
+        self,
+        action: str,
+        monster_name: str,
+        monster_description: str,
+        player_damage: int,
+        is_weakness: bool,
+        player: Player,
+        monster_retaliation_damage: Optional[int] = None,
+        player_health_after: Optional[int] = None
+    ) -> str:
+        """Render the combat-turn prompt shared by the sync and streaming paths."""
+        player_context = self._get_player_context(player)
+        weakness_text = " The creature is particularly vulnerable to this attack!" if is_weakness else ""
 
-Write only the description, no quotes or labels:"""
+        retaliation_text = f"\n\nAfter the attack, the {monster_name} retaliates, dealing {monster_retaliation_damage} damage. The player's remaining health is {player_health_after}."
 
-        return self._generate_narrative(prompt, max_tokens=350, history_label=f"Combat turn ({action})")
+        # The instructions and examples live in the pinned
+        # _COMBAT_TURN_INSTRUCTIONS system message; only the dynamic turn
+        # facts are sent per call so the request prefix stays cache-identical.
+        return _COMBAT_TURN_USER_TEMPLATE.format(
+            monster_name=monster_name,
+            monster_description=monster_description,
+            player_context=player_context,
+            action=action,
+            player_damage=player_damage,
+            weakness_text=weakness_text,
+            retaliation_text=retaliation_text,
+        )
 
     def describe_empty_room(self) -> str:
         """Generate narrative description of a room.
@@ -209,26 +1933,9 @@ Write only the description, no quotes or labels:"""
         Returns:
             A vivid description of an empty, quiet space in the dungeon.
         """
-        prompt = """A holy knight/paladin enters an empty room of an ancient underground dungeon.
-There are no monsters and no items to collect — only the atmosphere of the space itself.
-
-Write a vivid 1-3 sentence description of this empty room.
-Focus on environmental detail, mood, remnants of bandit activity, and the quiet tension of a place abandoned in haste.
-You may describe old furniture, scattered supplies, broken barricades, makeshift camps, ritual markings, collapsed stonework, or other atmospheric features — but nothing interactable.
-
-Capture the feeling of brief respite mixed with unease, like a dungeon master describing a room between encounters.
-
-Add emojis appropriately throughout the description to add color and visual interest (e.g., 🕯️ for torchlight, 🗝️ for keys, 📜 for scrolls, 🏺 for containers, etc.).
-
-Example style:
-"The corridor opens into a cramped study carved into the stone. A toppled desk lies on its side, its drawers yanked out and emptied long ago. Scraps of parchment litter the floor, torn and trampled by both boot and claw."
-"You step into a chamber where crude barricades of crates and broken furniture still lean against the walls. Bandits must have tried to fortify this place, but the splintered wood and dried drag marks suggest they didn't hold it for long."
-"A small campsite occupies the center of the room—cold ashes in a fire pit, bedrolls slashed open, a tin cup kicked against the far wall. Whatever happened here, it ended abruptly."
-
-Write only the description, with no quotes or labels:
-"""
+        prompt = _EMPTY_ROOM_USER_PROMPT
 
-        return self._generate_narrative(prompt, max_tokens=200, history_label="Empty room")
+        return self._generate_narrative(prompt, max_tokens=120, history_label="Empty room")
 
     def describe_loot_find(
         self,
@@ -244,11 +1951,34 @@ Write only the description, with no quotes or labels:
         Returns:
             A vivid description of finding the item.
         """
+        prompt, history_label = self._build_loot_prompt(item, player)
+
+        return self._cached_narrative(prompt, max_tokens=120, history_label=history_label,
+                                      model_override=_MODEL_BY_METHOD.get("describe_loot_find"))
+
+    async def adescribe_loot_find(self, item: DropResult, player: Player) -> str:
+        """Async counterpart of describe_loot_find, for gathered batches.
+
+        Bypasses the variant cache: batched calls are already paying the
+        round trip concurrently, and the single-flight map deduplicates
+        identical prompts within the batch.
+        """
+        prompt, history_label = self._build_loot_prompt(item, player)
+
+        return await self._agenerate_narrative(prompt, max_tokens=120, history_label=history_label,
+                                               model_override=_MODEL_BY_METHOD.get("describe_loot_find"))
+
+    def _build_loot_prompt(self, item: DropResult, player: Player) -> tuple:
+        """Render the loot prompt and history label shared by the sync and async paths.
+
+        Returns:
+            (prompt, history_label) for the loot narration
+        """
         player_context = self._get_player_context(player)
 
         # Format item name
-        if item in DropResult.unique_gear():
-            item_name = item.name.replace("_", " ").lower()
+        if item in _UNIQUE_GEAR_FROZEN:
+            item_name = _DROP_NAME[item]
             item_type = f"player's stolen gear ({item_name})"
         elif item == DropResult.HEALTH_POTION:
             item_name = "a health potion"
@@ -259,29 +1989,18 @@ Write only the description, with no quotes or labels:
         else:
             raise ValueError(f"Unexpected item type: {item}")
 
-        is_player_gear = item in DropResult.unique_gear()
+        is_player_gear = item in _UNIQUE_GEAR_FROZEN
         gear_context = " This is the player's own stolen equipment that was taken from them during an ambush. Describe it as high-quality holy knight gear." if is_player_gear else " This is regular loot the player finds."
 
-        prompt = f"""A holy knight/paladin searches a room in the dungeon and finds: {item_type}
-
-{player_context}
-{gear_context}
-
-Write a vivid 1-3 sentence description of finding this item. Describe how it's discovered, its condition, and the player's reaction. Be cinematic and immersive, like a dungeon master narrating a discovery.
-
-Add emojis appropriately throughout the description to add color and visual interest (e.g., 🛡️ for shields, 🗡️ for swords, ⚔️ for weapons, 🧪 for potions, 📜 for scrolls, ✨ for magic items, etc.).
-
-IMPORTANT: If it's the player's stolen gear (shield, sword, armor), describe it as their own equipment (e.g., "your shield", "your sword", "your helm"). If it's regular loot (potions, scrolls), describe it as something found.
-
-Example style (player's gear):
-"You notice a glint of metal in the corner. As you approach, you recognize the familiar shape of your shield, its radiant emblem still visible beneath a layer of grime. Your fingers close around the cool metal, and a sense of purpose returns to you."
-
-Example style (regular loot):
-"Tucked behind a fallen stone, you discover a small vial of crimson liquid. The glass is intact, and the potion within still glimmers with healing magic."
-
-Write only the description, no quotes or labels:"""
-
-        return self._generate_narrative(prompt, max_tokens=250, history_label=f"Loot find ({item_name})")
+        # The instructions and examples live in the pinned _LOOT_INSTRUCTIONS
+        # system message; only the dynamic facts are sent per call so the
+        # request prefix stays cache-identical.
+        prompt = _LOOT_USER_TEMPLATE.format(
+            item_type=item_type,
+            gear_context=gear_context,
+            player_context=player_context,
+        )
+        return prompt, f"Loot find ({item_name})"
 
     def describe_victory(
         self,
@@ -312,29 +2031,23 @@ Write only the description, no quotes or labels:"""
             weakness_text = " (this was a weakness hit - especially effective)" if is_weakness else ""
             action_text = f"\nThe knight defeated it with: {final_action}{weakness_text}"
 
-        prompt = f"""A holy knight/paladin has just defeated a monster with a final blow:
-- Monster: {monster_name}
-- Description: {monster_description}
-{action_text}
-{items_text}
-
-{player_context}
-
-Write a vivid 2-4 sentence description that combines BOTH the final attack and the monster's defeat. Describe the attack itself (how the knight strikes), the monster's reaction and final moments, how it falls, and if items are present, how the knight retrieves them. Be cinematic and immersive, like a dungeon master narrating a complete victory scene.
-
-Add emojis appropriately throughout the description to add color and visual interest (e.g., ⚔️ for combat, ✨ for magic, 💀 for death, 🛡️ for shields, 🗡️ for swords, 💎 for treasures, etc.).
-
-IMPORTANT:
-- Include the attack description in the narrative (e.g., "You raise your hand and unleash a blinding beam of holy power...")
-- Only mention equipment (shield, sword, armor) if the player actually has it or is acquiring it
-- If they don't have armor, describe them in simple clothing that might be worn under armor, not armor
-
-Example style:
-"You raise your hand, fingers outstretched, as the Light gathers around you in a brilliant aura. A surge of divine energy flows through your veins, igniting your spirit with righteous fury. With a thrust of your palm, you unleash a blinding beam of holy power that strikes the giant rat, searing through its matted fur and scorching its flesh. The creature lets out a piercing shriek, its body convulsing under the purifying light, before collapsing to the ground, smoldering and defeated. As you step closer, your heart races at the sight of your shield, half-buried beneath the rat's remains; you reach down, fingers trembling with anticipation, and grasp the familiar, cool metal, reclaiming a piece of your lost honor."
-
-Write only the description, no quotes or labels:"""
+        # Instructions live in the pinned _VICTORY_INSTRUCTIONS system
+        # message; only the dynamic kill facts are sent per call
+        prompt = _VICTORY_USER_TEMPLATE.format(
+            monster_name=monster_name,
+            monster_description=monster_description,
+            action_text=action_text,
+            items_text=items_text,
+            player_context=player_context,
+        )
 
-        return self._generate_narrative(prompt, max_tokens=300, history_label=f"Victory over {monster_name}")
+        bucket = (monster_name, item_acquired)
+        description = self._generate_narrative(
+            prompt, max_tokens=220, history_label=f"Victory over {monster_name}",
+            prediction=self._victory_priors.get(bucket),
+        )
+        self._victory_priors[bucket] = description
+        return description
 
     def _get_player_gear_list(self, player: Player) -> List[str]:
         """Get a list of all gear items the player currently has.
@@ -347,8 +2060,7 @@ Write only the description, no quotes or labels:"""
             gear_list.append("shield")
         if player.has_sword:
             gear_list.append("sword")
-        for armor_piece in player.owned_armor:
-            gear_list.append(armor_piece.name.replace("_", " ").lower())
+        gear_list.extend(_DROP_NAME[armor_piece] for armor_piece in player.owned_armor)
         return gear_list
 
     def _has_all_gear(self, player: Player) -> bool:
@@ -357,37 +2069,55 @@ Write only the description, no quotes or labels:"""
         Returns:
             True if player has shield, sword, and all 6 armor pieces
         """
-        all_gear = DropResult.unique_gear()
-        if not player.has_shield or not player.has_sword:
-            return False
-        # Check if player has all 6 armor pieces
-        armor_pieces = [item for item in all_gear if item not in (DropResult.SHIELD, DropResult.SWORD)]
-        return len(player.owned_armor) == len(armor_pieces)
+        # Two flag loads and a length compare against the import-time count
+        return (player.has_shield
+                and player.has_sword
+                and len(player.owned_armor) == _EXPECTED_ARMOR_COUNT)
 
     def _get_player_context(self, player: Player) -> str:
         """Generate context string about the player's current equipment state and health."""
-        gear_list = self._get_player_gear_list(player)
-        has_all_gear = self._has_all_gear(player)
-
-        if len(gear_list) == 0:
-            equipment_text = "IMPORTANT: The player has NO armor, NO shield, and NO sword. All their gear was stolen by goblin bandits. They are wearing only basic clothing that might be worn under armor, not armor."
-        elif has_all_gear:
-            equipment_text = "The player has recovered ALL of their stolen gear: shield, sword, and all armor pieces. They are now fully equipped as a holy knight. Only the Heart of Radiance (the holy relic) remains to be recovered from the final boss."
-        else:
-            equipment_text = f"The player currently has: {', '.join(gear_list)}. They are still missing some of their stolen gear."
+        # Within one combat turn the same (health, gear) state feeds both
+        # the turn narration and a possible victory narration; memoize the
+        # whole context string so the second call is a dict hit
+        ctx_key = (player.health, player.max_health, player.has_shield,
+                   player.has_sword, tuple(player.owned_armor))
+        cached_context = self._player_ctx_cache.get(ctx_key)
+        if cached_context is not None:
+            return cached_context
+
+        # The equipment sentence only depends on the gear state, which
+        # changes a handful of times per game; cache it per state so
+        # repeat narrations skip the gear-list rebuild entirely
+        gear_key = (player.has_shield, player.has_sword, tuple(player.owned_armor))
+        equipment_text = self._equipment_text_cache.get(gear_key)
+        if equipment_text is None:
+            gear_list = self._get_player_gear_list(player)
+            if len(gear_list) == 0:
+                equipment_text = "IMPORTANT: The player has NO armor, NO shield, and NO sword. All their gear was stolen by goblin bandits. They are wearing only basic clothing that might be worn under armor, not armor."
+            elif self._has_all_gear(player):
+                equipment_text = "The player has recovered ALL of their stolen gear: shield, sword, and all armor pieces. They are now fully equipped as a holy knight. Only the Heart of Radiance (the holy relic) remains to be recovered from the final boss."
+            else:
+                equipment_text = f"The player currently has: {', '.join(gear_list)}. They are still missing some of their stolen gear."
+            self._equipment_text_cache[gear_key] = equipment_text
 
         # Add health information
         health_percent = (player.health / player.max_health) * 100
         if health_percent <= 25:
-            health_status = "The player is critically injured and barely standing, moving with great difficulty."
+            health_status = _HEALTH_STATUS[0]
         elif health_percent <= 50:
-            health_status = "The player is badly wounded, moving slowly and with visible pain."
+            health_status = _HEALTH_STATUS[1]
         elif health_percent <= 75:
-            health_status = "The player is moderately injured but still capable of fighting."
+            health_status = _HEALTH_STATUS[2]
         else:
-            health_status = "The player is in good condition, with only minor wounds."
+            health_status = _HEALTH_STATUS[3]
 
-        return f"{equipment_text}\n\nHealth: {player.health}/{player.max_health} HP. {health_status}"
+        player_context = f"{equipment_text}\n\nHealth: {player.health}/{player.max_health} HP. {health_status}"
+        # Health changes every turn, so old fingerprints go stale fast;
+        # keep the memo tiny and drop the oldest entry past the cap
+        if len(self._player_ctx_cache) >= _PLAYER_CTX_CACHE_MAX:
+            self._player_ctx_cache.pop(next(iter(self._player_ctx_cache)))
+        self._player_ctx_cache[ctx_key] = player_context
+        return player_context
 
     def describe_pray(self, player: Player) -> str:
         """Generate narrative description of the player praying for restoration.
@@ -396,22 +2126,10 @@ Write only the description, no quotes or labels:"""
             player: The player object
         """
         player_context = self._get_player_context(player)
-        prompt = f"""A holy knight/paladin, injured and weary, kneels to pray for restoration.
-
-{player_context}
+        # Instructions live in the pinned _PRAY_INSTRUCTIONS system message
+        prompt = _PRAY_USER_TEMPLATE.format(player_context=player_context)
 
-Write a vivid 1-3 sentence description of the prayer. Describe how the knight kneels, calls upon their god, and feels the divine light heal their wounds. Be atmospheric and immersive, like a dungeon master narrating a moment of faith.
-
-Add emojis appropriately throughout the description to add color and visual interest (e.g., ✨ for divine light, 🙏 for prayer, 💫 for healing, ⚡ for divine power, etc.).
-
-IMPORTANT: Do NOT mention armor, shield, or sword unless the player actually has them. If they don't have armor, describe them in simple clothing that might be worn under armor, not armor.
-
-Example style (when no armor):
-"You drop to one knee on the cold stone, pressing your hands together in prayer. The words of devotion flow from your lips as you call upon the Light. Warm, golden radiance envelops you, and you feel your wounds knitting closed, your strength returning. The divine power courses through you, and you rise, ready to continue your quest."
-
-Write only the description, no quotes or labels:"""
-
-        return self._generate_narrative(prompt, max_tokens=250, history_label="Prayer for restoration")
+        return self._cached_narrative(prompt, max_tokens=120, history_label="Prayer for restoration")
 
     def describe_all_gear_recovered(self, player: Player) -> str:
         """Generate narrative description when the player recovers the final piece of gear.
@@ -424,60 +2142,43 @@ Write only the description, no quotes or labels:"""
         """
         player_context = self._get_player_context(player)
 
-        prompt = f"""A holy knight/paladin has just recovered the final piece of their stolen gear. They now have ALL of their equipment back: shield, sword, and all armor pieces.
-
-{player_context}
-
-Write a vivid 2-4 sentence description of this momentous occasion. The knight should feel a surge of hope and determination. They have recovered everything that was stolen from them - their complete holy knight's regalia. Now, only one thing remains: the Heart of Radiance, the sacred relic that the final boss holds. The knight should feel ready for the final confrontation, knowing that with all their gear restored, they can face the ultimate challenge.
-
-Be emotional and triumphant, but also focused on the final goal. This is a turning point in their journey.
-
-Add emojis appropriately throughout the description to add color and visual interest (e.g., ✨ for triumph, 🛡️ for armor, ⚔️ for readiness, 💎 for the relic, 🌟 for hope, etc.).
-
-Example style:
-"You feel the weight of the final piece settle into place, and suddenly, you are whole again. Every piece of your stolen regalia has been reclaimed - your shield, your sword, your helm, your armor. The familiar weight of your complete holy knight's equipment fills you with a sense of purpose you haven't felt since the ambush. You stand tall, fully restored, and your gaze turns toward the deeper darkness where the final boss awaits. The Heart of Radiance calls to you, and you are ready to answer."
-
-Write only the description, no quotes or labels:"""
+        # Instructions live in the pinned _ALL_GEAR_INSTRUCTIONS system message
+        prompt = _ALL_GEAR_USER_TEMPLATE.format(player_context=player_context)
 
-        return self._generate_narrative(prompt, max_tokens=300, history_label="All gear recovered")
+        return self._generate_narrative(prompt, max_tokens=220, history_label="All gear recovered")
 
     def describe_potion_use(self, player: Player) -> str:
         """Generate narrative description of using a health potion."""
         player_context = self._get_player_context(player)
 
-        prompt = f"""A holy knight/paladin drinks a health potion during combat or rest.
-
-{player_context}
-
-Write a vivid 1-3 sentence description of drinking the potion. Describe the act of drinking, the taste, and the healing effect. Be atmospheric and immersive, like a dungeon master narrating item use.
-
-Add emojis appropriately throughout the description to add color and visual interest (e.g., 🧪 for potions, ✨ for healing magic, 💚 for health, 💫 for restoration, etc.).
-
-Example style:
-"You uncork the vial and drink the shimmering liquid in one swift motion. The potion tastes of honey and light, spreading warmth through your body. Your wounds close, your breathing steadies, and strength floods back into your limbs."
-
-Write only the description, no quotes or labels:"""
+        # Instructions live in the pinned _POTION_INSTRUCTIONS system message
+        prompt = _POTION_USER_TEMPLATE.format(player_context=player_context)
 
-        return self._generate_narrative(prompt, max_tokens=250, history_label="Potion use")
+        return self._cached_narrative(prompt, max_tokens=120, history_label="Potion use")
 
     def describe_flee(self, success: bool, monster_name: str) -> str:
         """Generate narrative description of attempting to flee."""
-        prompt = f"""A holy knight/paladin attempts to flee from combat with: {monster_name}
-
-The attempt was {'successful' if success else 'unsuccessful'}.
-
-Write a vivid 1-3 sentence description of the attempt to flee. Be atmospheric and immersive, like a dungeon master narrating escape.
-
-Add emojis appropriately throughout the description to add color and visual interest (e.g., 🏃 for running, 💨 for speed, ⚠️ for danger, etc.).
-
-{'Example for success: "You break away from the creature, turning and sprinting down the corridor. The monster\'s snarls fade behind you as you put distance between yourself and danger."' if success else 'Example for failure: "You try to disengage, but the creature is too quick. Its claws rake across your back as you turn, forcing you back into the fight."'}
-
-Write only the description, no quotes or labels:"""
+        history_label = f"Flee attempt ({'success' if success else 'failed'})"
+        # Most flee narrations come from the local templates: instant and
+        # free, with the API path kept for variety
+        if random.random() < _LOCAL_FLEE_PROBABILITY:
+            templates = _LOCAL_FLEE_SUCCESS if success else _LOCAL_FLEE_FAILURE
+            description = random.choice(templates).format(monster_name=monster_name)
+            self._append_history(f"{history_label}: {description}")
+            return description
+
+        # Instructions and both outcome examples live in the pinned
+        # _FLEE_INSTRUCTIONS system message
+        prompt = _FLEE_USER_TEMPLATE.format(
+            monster_name=monster_name,
+            outcome="successful" if success else "unsuccessful",
+        )
 
-        return self._generate_narrative(
+        return self._cached_narrative(
             prompt,
-            max_tokens=250,
-            history_label=f"Flee attempt ({'success' if success else 'failed'})"
+            max_tokens=120,
+            history_label=history_label,
+            model_override=_MODEL_BY_METHOD.get("describe_flee"),
         )
 
     def describe_encounter(
@@ -485,19 +2186,81 @@ Write only the description, no quotes or labels:"""
         monster_name: str,
         monster_description: str,
         item: Optional[DropResult],
-        player: Player
+        player: Player,
+        stream: Optional[bool] = None
     ) -> str:
         """Generate a full narrative encounter description like a dungeon master.
 
+        The monster's item drop is woven into this same scene, so one API
+        call covers the whole encounter — there is no separate per-item
+        description round trip to amortize.
+
         Args:
             monster_name: Name of the monster (e.g., "Giant Rat")
             monster_description: Base description of the monster
             item: The item that will drop (None or NO_ITEM means no item)
             player: The player object
+            stream: When True, print tokens to stdout as they arrive instead
+                of blocking until the full completion is generated;
+                defaults to the constructor's stream flag
 
         Returns:
             A full narrative description of the encounter scene.
         """
+        if stream is None:
+            stream = self.stream_output
+        prompt = self._build_encounter_prompt(monster_name, monster_description, item, player)
+
+        history_label = f"Encounter with {monster_name}"
+        if stream:
+            return self._stream_to_stdout(prompt, max_tokens=180, history_label=history_label)
+        return self._generate_narrative(prompt, max_tokens=180, history_label=history_label)
+
+    def stream_encounter(
+        self,
+        monster_name: str,
+        monster_description: str,
+        item: Optional[DropResult],
+        player: Player
+    ):
+        """Streaming counterpart of describe_encounter.
+
+        Yields text fragments as they arrive so the encounter scene can
+        render at time-to-first-token; history is updated at stream end.
+        """
+        prompt = self._build_encounter_prompt(monster_name, monster_description, item, player)
+
+        return self.stream_narrative(prompt, max_tokens=180, history_label=f"Encounter with {monster_name}")
+
+    async def adescribe_encounter(
+        self,
+        monster_name: str,
+        monster_description: str,
+        item: Optional[DropResult],
+        player: Player
+    ) -> str:
+        """Async counterpart of describe_encounter, for gathered batches.
+
+        Lets a scene that needs several narrations (e.g. an encounter plus
+        loot finds) overlap the round trips via asyncio.gather instead of
+        paying them serially.
+        """
+        prompt = self._build_encounter_prompt(monster_name, monster_description, item, player)
+
+        # Encounter narrations block the player at the top of a combat, so
+        # they get the tail-latency insurance of a raced duplicate request
+        return await self._agenerate_narrative(prompt, max_tokens=180,
+                                               history_label=f"Encounter with {monster_name}",
+                                               race=True)
+
+    def _build_encounter_prompt(
+        self,
+        monster_name: str,
+        monster_description: str,
+        item: Optional[DropResult],
+        player: Player
+    ) -> str:
+        """Render the encounter prompt shared by the sync and streaming paths."""
         player_context = self._get_player_context(player)
         # Determine if item is player's stolen gear or monster's regular loot
         is_player_gear = False
@@ -505,14 +2268,8 @@ Write only the description, no quotes or labels:"""
 
         if item is not None and item != DropResult.NO_ITEM:
             # Player's stolen gear: shield, sword, and all armor pieces
-            is_player_gear = item in DropResult.unique_gear()
-            if item == DropResult.SHIELD:
-                item_description = "a shield"
-            elif item == DropResult.SWORD:
-                item_description = "a sword"
-            else:
-                # Armor piece or regular loot
-                item_description = item.name.replace("_", " ").lower()
+            is_player_gear = item in _UNIQUE_GEAR_FROZEN
+            item_description = _ENCOUNTER_ITEM_NAME[item]
 
         items_text = ""
         if item_description:
@@ -521,32 +2278,12 @@ Write only the description, no quotes or labels:"""
             else:
                 items_text = f"The creature has or is near: {item_description} (this is regular loot the monster has)"
 
-        prompt = f"""You are a dungeon master describing a scene to players. A holy knight/paladin enters a room and encounters:
-
-Monster: {monster_name}
-Description: {monster_description}
-{f"Items present: {items_text}" if items_text else "No notable items visible."}
-
-{player_context}
-
-IMPORTANT: If the item is marked as "player's stolen holy knight gear" (shield, sword, or any armor piece), describe it as the player's own high-quality equipment that was stolen by goblin bandits. Use phrases like "your gleaming shield", "your blessed sword", "your ornate helm", etc. - these are the paladin's own gear, fit for a holy knight. If the item is marked as "regular loot" (potions, scrolls), describe it as something the monster naturally has or has scavenged.
-
-Write a vivid, atmospheric 1-4 sentence description of this encounter scene. Describe the monster naturally as part of the scene, not as a mechanical announcement.
-- Start with the scene/setting (torchlight, shadows, sounds, etc.)
-- Describe the monster as the player would see it
-- If an item is present, weave it naturally into the description
-- Be immersive and atmospheric, like you're telling a story at a tabletop game
-- Do NOT start with "Enemy spotted:" or similar mechanical phrases
-- Write in second person ("you see", "you notice", etc.)
-
-Add emojis appropriately throughout the description to add color and visual interest (e.g., 🕯️ for torchlight, 👹 for monsters, 🛡️ for shields, 🗡️ for swords, 🧪 for potions, 💀 for skeletons, etc.).
-
-Example style (with player's gear):
-"A massive rat startles at your approach, its whiskers twitching above a shallow pile of scavenged debris. Half-buried there is your shield—its radiant crest muted under dust but unmistakably yours. The creature chitters defensively, as if guarding the strange prize it claimed."
-
-Example style (with monster loot):
-"The dim corridor opens into a wider chamber where a skeletal figure stands guard, its hollow eyes fixed on you. In its bony grasp, you notice a small vial of crimson liquid - a health potion, likely scavenged from some unfortunate adventurer."
-
-Write only the description, no quotes or labels:"""
-
-        return self._generate_narrative(prompt, max_tokens=300, history_label=f"Encounter with {monster_name}")
+        # The instructions and examples live in the pinned
+        # _ENCOUNTER_INSTRUCTIONS system message; only the dynamic facts
+        # are sent per call so the request prefix stays cache-identical.
+        return _ENCOUNTER_USER_TEMPLATE.format(
+            monster_name=monster_name,
+            monster_description=monster_description,
+            items_line=f"Items present: {items_text}" if items_text else "No notable items visible.",
+            player_context=player_context,
+        )
@@ -1,17 +1,19 @@
 from __future__ import annotations
 
 import random
+from collections import deque
 from dataclasses import dataclass, field
-from enum import Enum, auto
-from typing import List, Set, Callable, Dict, Optional
+from enum import Enum, IntEnum, auto
+from typing import List, Set, FrozenSet, Callable, Dict, NamedTuple, Optional, Tuple
 
 import config
 
 
-class Action(Enum):
+class Action(IntEnum):
     # OO rationale: Domain vocabulary for player intents. Using an Enum fixes the set
     # of valid actions at compile-time, enabling explicit branching and avoiding
-    # stringly-typed conditionals throughout the system.
+    # stringly-typed conditionals throughout the system. IntEnum so hot paths
+    # can index small lookup tables directly by action value.
     USE_POTION = auto()
     FLEE = auto()
     SWORD_SLASH = auto()
@@ -19,7 +21,7 @@ class Action(Enum):
     HOLY_SMITE = auto()
 
 
-class Weakness(Enum):
+class Weakness(IntEnum):
     # OO rationale: Encodes monster susceptibility traits. Separating weaknesses
     # from abilities supports simple mapping logic (action -> weakness) and
     # keeps combat rules declarative.
@@ -28,6 +30,29 @@ class Weakness(Enum):
     HOLY_SMITE = auto()
 
 
+# Action-to-weakness correspondence as a tuple indexed directly by Action
+# value (both enums are IntEnums), built once at import. Damage
+# application runs every combat hit, so the lookup is a single indexed
+# load with no hashing (see Monster.apply_weakness_bonus).
+_WEAKNESS_BY_ACTION_VALUE: Tuple[Optional[Weakness], ...] = tuple(
+    {
+        Action.HOLY_SMITE: Weakness.HOLY_SMITE,
+        Action.SWORD_SLASH: Weakness.SWORD_SLASH,
+        Action.SHIELD_BASH: Weakness.SHIELD_BASH,
+    }.get(value)
+    for value in range(max(Action) + 1)
+)
+
+
+# Pre-rolled attack-variance values, refilled in chunks so each monster
+# strike pops a ready int instead of paying the full randint call path
+# (argument checks plus a generator step) per attack. Module-level so the
+# pool is shared by every Monster instance.
+_VARIANCE_VALUES = (0, 1, 2)
+_VARIANCE_POOL_CHUNK = 256
+_variance_pool: deque = deque()
+
+
 class RoomType(Enum):
     # OO rationale: Enum for different room types in the dungeon, providing
     # type safety and preventing magic string errors in room generation.
@@ -53,20 +78,32 @@ class DropResult(Enum):
     BOOTS = auto()
 
     @classmethod
-    def unique_gear(cls) -> List["DropResult"]:
+    def unique_gear(cls) -> Tuple["DropResult", ...]:
         """Return all unique gear items (shield, sword, and armor pieces)."""
-        return [
-            cls.SHIELD,
-            cls.SWORD,
-            cls.HELM,
-            cls.PAULDRONS,
-            cls.CUIRASS,
-            cls.GAUNTLETS,
-            cls.LEG_GUARDS,
-            cls.BOOTS,
-        ]
-
-@dataclass
+        return UNIQUE_GEAR
+
+# Built once at import so unique_gear() callers don't allocate a fresh list
+# on every lookup. UNIQUE_GEAR is the public name; the classmethod above
+# stays as a thin compatibility wrapper over the same tuple.
+UNIQUE_GEAR: Tuple[DropResult, ...] = (
+    DropResult.SHIELD,
+    DropResult.SWORD,
+    DropResult.HELM,
+    DropResult.PAULDRONS,
+    DropResult.CUIRASS,
+    DropResult.GAUNTLETS,
+    DropResult.LEG_GUARDS,
+    DropResult.BOOTS,
+)
+
+# Armor subset of the unique gear (everything but shield and sword), cached
+# as a frozenset for O(1) membership and len() without per-call filtering
+ARMOR_PIECES: FrozenSet[DropResult] = frozenset(
+    gear for gear in UNIQUE_GEAR if gear not in (DropResult.SHIELD, DropResult.SWORD)
+)
+
+
+@dataclass(slots=True)
 class Actor:
     # OO rationale: Abstract base for battle participants capturing shared
     # invariants (health bounds) and behavior (damage application, aliveness).
@@ -88,7 +125,7 @@ class Actor:
         return self.health > 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Inventory:
     # OO rationale: Encapsulates consumable counts and rules for mutation,
     # enforcing invariants (no negative counts) at a single point. Keeps
@@ -97,7 +134,10 @@ class Inventory:
     num_escape_scrolls: int = 0
 
     def add_potion(self, amount: int = 1) -> None:
-        self.num_potions += max(0, amount)
+        # Branch instead of max(): skips the builtin lookup and call for
+        # the overwhelmingly common amount=1 case
+        if amount > 0:
+            self.num_potions += amount
 
     def remove_potion(self, amount: int = 1) -> bool:
         if self.num_potions >= amount:
@@ -106,7 +146,8 @@ class Inventory:
         return False
 
     def add_escape_scroll(self, amount: int = 1) -> None:
-        self.num_escape_scrolls += max(0, amount)
+        if amount > 0:
+            self.num_escape_scrolls += amount
 
     def remove_escape_scroll(self, amount: int = 1) -> bool:
         if self.num_escape_scrolls >= amount:
@@ -115,7 +156,7 @@ class Inventory:
         return False
 
 
-@dataclass
+@dataclass(slots=True)
 class Player(Actor):
     # OO rationale: Concrete combatant with composition (Inventory) and
     # capabilities (abilities map). Keeps responsibility cohesive: defense,
@@ -125,16 +166,43 @@ class Player(Actor):
     owned_armor: Set[DropResult] = field(default_factory=set)
     has_shield: bool = False  # unlocks after first monster fight
     has_sword: bool = False   # unlocks after third monster fight
+    # Memoized abilities mapping; rebuilt only when gear unlocks change it
+    _abilities_cache: Optional[Dict[Action, Callable[[], int]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Matching tuple of unlocked ability actions, for menu building
+    _ability_actions_cache: Optional[Tuple[Action, ...]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Total defense, recomputed only when gear changes (see _recompute_defense)
+    _cached_defense: int = field(default=0, init=False, repr=False, compare=False)
 
-    def get_defense(self) -> int:
+    def __post_init__(self) -> None:
+        # Explicit base call: slots=True makes dataclasses rebuild the
+        # class object, which breaks zero-argument super() in methods
+        # defined on the pre-rebuild class
+        Actor.__post_init__(self)
+        self._recompute_defense()
+
+    def _recompute_defense(self) -> None:
+        """Refresh the cached defense total from the current gear state.
+
+        Defense only changes on armor pickups and the shield unlock, so
+        the per-attack get_defense call reduces to one attribute read
+        instead of redoing the arithmetic every monster retaliation.
+        """
         defense_from_armor = len(self.owned_armor) * config.ARMOR_DEFENSE_BONUS_PER_PIECE
         defense_from_shield = 3 if self.has_shield else 0
-        return self.base_defense + defense_from_armor + defense_from_shield
+        self._cached_defense = self.base_defense + defense_from_armor + defense_from_shield
+
+    def get_defense(self) -> int:
+        return self._cached_defense
 
     def add_armor_piece(self, armor_piece: DropResult) -> None:
         """Add an armor piece to the player's owned armor set."""
         if armor_piece not in self.owned_armor:
             self.owned_armor.add(armor_piece)
+            self._recompute_defense()
 
     def use_potion(self) -> bool:
         if self.inventory.remove_potion():
@@ -165,39 +233,72 @@ class Player(Actor):
     def pray_for_restoration(self) -> None:
         self.health = self.max_health
 
-    def abilities(self) -> Dict[Action, Callable[[], int]]:
-        mapping: Dict[Action, Callable[[], int]] = {Action.HOLY_SMITE: self.holy_smite}
-        if self.has_sword:
-            mapping[Action.SWORD_SLASH] = self.sword_slash
-        if self.has_shield:
-            mapping[Action.SHIELD_BASH] = self.shield_bash
-        return mapping
-
+    def unlock_shield(self) -> None:
+        """Unlock Shield Bash and invalidate the cached abilities mapping."""
+        self.has_shield = True
+        self._abilities_cache = None
+        self._ability_actions_cache = None
+        self._recompute_defense()
+
+    def unlock_sword(self) -> None:
+        """Unlock Sword Slash and invalidate the cached abilities mapping."""
+        self.has_sword = True
+        self._abilities_cache = None
+        self._ability_actions_cache = None
+
+    def ability_actions(self) -> Tuple[Action, ...]:
+        """Tuple of the player's unlocked ability actions (cached)."""
+        if self._ability_actions_cache is None:
+            self._ability_actions_cache = tuple(self.abilities())
+        return self._ability_actions_cache
 
-@dataclass
+    def abilities(self) -> Dict[Action, Callable[[], int]]:
+        # The mapping only changes when gear unlocks, so build it lazily and
+        # reuse it across the (multiple) lookups every combat turn performs
+        if self._abilities_cache is None:
+            mapping: Dict[Action, Callable[[], int]] = {Action.HOLY_SMITE: self.holy_smite}
+            if self.has_sword:
+                mapping[Action.SWORD_SLASH] = self.sword_slash
+            if self.has_shield:
+                mapping[Action.SHIELD_BASH] = self.shield_bash
+            self._abilities_cache = mapping
+        return self._abilities_cache
+
+
+@dataclass(slots=True)
 class Monster(Actor):
     # OO rationale: Concrete combatant representing adversaries. Holds static
     # traits (name, description) and combat modifiers (weaknesses).
     # Weakness handling is encapsulated to keep GameSystem orchestration lean.
     name: str = "Unknown"
-    weaknesses: List[Weakness] = field(default_factory=list)
+    # Frozenset keeps the per-turn weakness membership test O(1) and makes
+    # the traits immutable after construction
+    weaknesses: FrozenSet[Weakness] = field(default_factory=frozenset)
     description: str = ""
     is_boss: bool = False
     item_drop: Optional["DropResult"] = None
+    # Weakness set packed into an int (bit i set when Weakness(i) is
+    # present), derived once at construction so the per-hit test is a
+    # shift and a mask instead of a set lookup
+    weakness_mask: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Explicit base call: slots=True rebuilds the class object, which
+        # breaks zero-argument super() here (see Player.__post_init__)
+        Actor.__post_init__(self)
+        for weakness in self.weaknesses:
+            self.weakness_mask |= 1 << weakness
 
     def attack(self) -> int:
-        # Slight randomness to monster damage
-        damage_variance = random.randint(0, 2)
-        return self.strength + damage_variance
+        # Slight randomness to monster damage, drawn from the shared
+        # pre-rolled pool (see _variance_pool)
+        if not _variance_pool:
+            _variance_pool.extend(random.choices(_VARIANCE_VALUES, k=_VARIANCE_POOL_CHUNK))
+        return self.strength + _variance_pool.popleft()
 
     def apply_weakness_bonus(self, action: Action, base_damage: int) -> int:
-        ACTION_WEAKNESS_MAP = {
-            Action.HOLY_SMITE: Weakness.HOLY_SMITE,
-            Action.SWORD_SLASH: Weakness.SWORD_SLASH,
-            Action.SHIELD_BASH: Weakness.SHIELD_BASH,
-        }
-        matching_weakness = ACTION_WEAKNESS_MAP.get(action)
-        if matching_weakness is not None and matching_weakness in self.weaknesses:
+        matching_weakness = _WEAKNESS_BY_ACTION_VALUE[action]
+        if matching_weakness is not None and (self.weakness_mask >> matching_weakness) & 1:
             return base_damage + config.WEAKNESS_BONUS_DAMAGE
         return base_damage
 
@@ -231,6 +332,7 @@ class MonsterTemplate:
     hp: Optional[int] = None  # If None, use random range
     strength: Optional[int] = None  # If None, use random range
     is_boss: bool = False
+    spawn_weight: float = 1.0  # Relative spawn frequency among regular foes
 
 
 @dataclass
@@ -248,17 +350,36 @@ class RoomTypeOption:
             raise ValueError(f"Spawn weight must be non-negative, got {self.spawn_weight}")
 
 
-@dataclass
-class CombatResult:
+class TurnResult(NamedTuple):
+    """Outcome of a single combat turn executed by the CombatEngine.
+
+    OO rationale: A NamedTuple instead of an ad-hoc dict keeps field access
+    cheap and self-documenting for the per-turn hot path, with no dict or
+    string-key allocations per turn.
+    """
+    action_executed: bool = True
+    non_damage_action: bool = False
+    flee_succeeded: bool = False
+    monster_died: bool = False
+    is_weakness_hit: bool = False
+    player_damage_dealt: int = 0
+    monster_retaliation_damage: Optional[int] = None
+    player_health_after: Optional[int] = None
+    base_damage: int = 0
+    final_damage: int = 0
+
+
+class CombatResult(NamedTuple):
     """Represents the outcome of a combat phase.
 
-    OO rationale: Encapsulates combat phase results in a type-safe structure
-    instead of using complex tuples. Makes combat outcomes self-documenting
-    and easier to work with.
+    OO rationale: A NamedTuple keeps combat outcomes self-documenting with
+    C-level field access and no per-combat object overhead. The fled flag is
+    a plain field (named distinctly from the player_fled constructor, which
+    previously shadowed a same-named dataclass field).
     """
     # Combat outcome
     defeated_monster: Optional['Monster'] = None
-    player_fled: bool = False
+    fled: bool = False
 
     # Combat details (only relevant if monster was defeated)
     final_action: Optional['Action'] = None
@@ -267,7 +388,7 @@ class CombatResult:
     @property
     def combat_ended(self) -> bool:
         """True if combat ended (monster defeated or player fled)."""
-        return self.defeated_monster is not None or self.player_fled
+        return self.defeated_monster is not None or self.fled
 
     @property
     def monster_was_defeated(self) -> bool:
@@ -286,7 +407,7 @@ class CombatResult:
     @classmethod
     def player_fled(cls) -> 'CombatResult':
         """Create a result for player fleeing."""
-        return cls(player_fled=True)
+        return cls(fled=True)
 
     @classmethod
     def combat_continues(cls) -> 'CombatResult':
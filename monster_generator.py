@@ -6,10 +6,62 @@ and boss encounters based on game progress.
 
 from __future__ import annotations
 
+from bisect import bisect
+from itertools import accumulate
+
 import config
 from models import Monster, MonsterTemplate, Weakness
 from utils import RandomProvider
 
+# Regular-foe templates, frozen once at import. A tuple (rather than a
+# per-instance list) keeps the table immutable and shared; spawn weights
+# are uniform today but the cumulative table below makes weighted spawns
+# a data change, not a code change.
+_MONSTER_TEMPLATES = (
+    MonsterTemplate(
+        name="Skeleton",
+        weaknesses=[Weakness.HOLY_SMITE],
+        description="A humanoid frame of loose bones held by brittle bindings; light, rattling steps and hollow gaze.",
+    ),
+    MonsterTemplate(
+        name="Goblin Bandit",
+        weaknesses=[Weakness.SWORD_SLASH],
+        description="A small, agile greenskin with oversized ears and quick hands; favors scavenged gear and sudden lunges.",
+    ),
+    MonsterTemplate(
+        name="Giant Rat",
+        weaknesses=[Weakness.SHIELD_BASH],
+        description="An oversized rat with patchy fur and prominent incisors; jittery, low to the ground, always testing distance.",
+    ),
+    MonsterTemplate(
+        name="Wraith",
+        weaknesses=[Weakness.HOLY_SMITE],
+        description="A dim, humanoid outline woven from chill mist; light fades and warmth thins in its presence.",
+    ),
+)
+
+# The single end-of-run boss, built once at import like the regular
+# templates above so each spawn skips re-allocating the long description
+_BOSS_TEMPLATE = MonsterTemplate(
+    name="Grave Tyrant",
+    weaknesses=[],
+    description=(
+        "An armored lich-king draped in funereal banners. A corroded crown sits on a skull carved with runes; "
+        "a great blade of black iron rests across its lap. Plates of ornate mail are missing in places, "
+        "revealing ribs choked with grave dust. Clutched in its skeletal grasp, the Heart of Radiance pulses "
+        "with a faint, struggling light—the sacred relic you came to reclaim, its divine radiance dimmed but "
+        "not extinguished by the creature's dark presence."
+    ),
+    hp=config.BOSS_HP,
+    strength=config.BOSS_STRENGTH,
+    is_boss=True,
+)
+
+# Cumulative spawn weights matching _MONSTER_TEMPLATES, so selection is a
+# single random draw plus a binary search (same scheme the room table in
+# game_engine uses)
+_CUM_SPAWN_WEIGHTS = tuple(accumulate(t.spawn_weight for t in _MONSTER_TEMPLATES))
+
 
 class MonsterGenerator:
     """Generates monsters based on templates and game progress.
@@ -22,29 +74,7 @@ class MonsterGenerator:
 
     def __init__(self, random_provider: RandomProvider) -> None:
         self.random_provider = random_provider
-        self._templates = [
-            # Regular foes
-            MonsterTemplate(
-                name="Skeleton",
-                weaknesses=[Weakness.HOLY_SMITE],
-                description="A humanoid frame of loose bones held by brittle bindings; light, rattling steps and hollow gaze.",
-            ),
-            MonsterTemplate(
-                name="Goblin Bandit",
-                weaknesses=[Weakness.SWORD_SLASH],
-                description="A small, agile greenskin with oversized ears and quick hands; favors scavenged gear and sudden lunges.",
-            ),
-            MonsterTemplate(
-                name="Giant Rat",
-                weaknesses=[Weakness.SHIELD_BASH],
-                description="An oversized rat with patchy fur and prominent incisors; jittery, low to the ground, always testing distance.",
-            ),
-            MonsterTemplate(
-                name="Wraith",
-                weaknesses=[Weakness.HOLY_SMITE],
-                description="A dim, humanoid outline woven from chill mist; light fades and warmth thins in its presence.",
-            ),
-        ]
+        self._templates = _MONSTER_TEMPLATES
 
     def generate_monster(self, monsters_defeated: int) -> Monster:
         """Generate a monster based on current game progress.
@@ -64,7 +94,12 @@ class MonsterGenerator:
 
     def _create_regular_monster(self) -> Monster:
         """Create a regular monster from templates."""
-        monster_template = self.random_provider.choice(self._templates)
+        # Weighted draw against the precomputed cumulative table; goes
+        # through the RandomProvider so tests stay deterministic
+        random_value = self.random_provider.random() * _CUM_SPAWN_WEIGHTS[-1]
+        monster_template = self._templates[
+            min(bisect(_CUM_SPAWN_WEIGHTS, random_value), len(self._templates) - 1)
+        ]
         max_health_points = monster_template.hp or self.random_provider.randint(
             config.MONSTER_HEALTH_MIN, config.MONSTER_HEALTH_MAX
         )
@@ -75,34 +110,19 @@ class MonsterGenerator:
             max_health=max_health_points,
             strength=attack_strength,
             name=monster_template.name,
-            weaknesses=list(monster_template.weaknesses),
+            weaknesses=frozenset(monster_template.weaknesses),
             description=monster_template.description,
             is_boss=monster_template.is_boss,
         )
 
     def _create_boss(self) -> Monster:
         """Create the end-game boss monster."""
-        # Single end-of-run boss
-        boss_template = MonsterTemplate(
-            name="Grave Tyrant",
-            weaknesses=[],
-            description=(
-                "An armored lich-king draped in funereal banners. A corroded crown sits on a skull carved with runes; "
-                "a great blade of black iron rests across its lap. Plates of ornate mail are missing in places, "
-                "revealing ribs choked with grave dust. Clutched in its skeletal grasp, the Heart of Radiance pulses "
-                "with a faint, struggling light—the sacred relic you came to reclaim, its divine radiance dimmed but "
-                "not extinguished by the creature's dark presence."
-            ),
-            hp=config.BOSS_HP,
-            strength=config.BOSS_STRENGTH,
-            is_boss=True,
-        )
-        # Use the template values directly (no randomization for boss)
+        # Use the shared template values directly (no randomization for boss)
         return Monster(
-            max_health=boss_template.hp,
-            strength=boss_template.strength,
-            name=boss_template.name,
-            weaknesses=list(boss_template.weaknesses),
-            description=boss_template.description,
-            is_boss=boss_template.is_boss,
+            max_health=_BOSS_TEMPLATE.hp,
+            strength=_BOSS_TEMPLATE.strength,
+            name=_BOSS_TEMPLATE.name,
+            weaknesses=frozenset(_BOSS_TEMPLATE.weaknesses),
+            description=_BOSS_TEMPLATE.description,
+            is_boss=_BOSS_TEMPLATE.is_boss,
         )
@@ -34,7 +34,8 @@ class NarrativeEngine:
         self,
         narrative_generator: Callable[[], str],
         event_type: Optional[str],
-        mode: str = "exploration"
+        mode: str = "exploration",
+        already_rendered: bool = False
     ) -> None:
         """Generate narrative text with loading indicator and error handling.
 
@@ -42,16 +43,21 @@ class NarrativeEngine:
             narrative_generator: A callable that returns the narrative description string
             event_type: Type of event to track (e.g., "encounter", "victory", "loot") or None to skip tracking
             mode: UI mode for header display ("exploration" or "combat")
+            already_rendered: True when the generator streams its text to
+                the terminal itself; skips the loading indicator and the
+                panel repaint so the narration is not shown twice
         """
         ui.clear_terminal()
 
-        print("Story Teller is thinking...", end="", flush=True)
+        if not already_rendered:
+            print("Story Teller is thinking...", end="", flush=True)
         try:
             narrative_text = narrative_generator()
-            print("\r" + " " * 30 + "\r", end="", flush=True)
             if event_type:
                 self.storyteller.track_event(event_type, narrative_text)
-            ui.display_narrative_panel(narrative_text, mode)
+            if not already_rendered:
+                print("\r" + " " * 30 + "\r", end="", flush=True)
+                ui.display_narrative_panel(narrative_text, mode)
         except Exception as e:
             print()
             print(f"Error generating description: {e}", flush=True)
@@ -141,7 +147,8 @@ Weak but alive, you feel the quiet warmth of your connection to the Light. It ha
                 player
             ),
             "encounter",
-            "combat"
+            "combat",
+            already_rendered=getattr(self.storyteller, "stream_output", False)
         )
 
     def describe_flee_attempt(self, succeeded: bool, monster_name: str) -> None:
@@ -169,7 +176,8 @@ Weak but alive, you feel the quiet warmth of your connection to the Light. It ha
                 player_health_after=player_health_after
             ),
             "combat",
-            "combat"
+            "combat",
+            already_rendered=getattr(self.storyteller, "stream_output", False)
         )
 
     def describe_victory(self, monster, item_name: Optional[str], player: Player,
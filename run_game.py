@@ -30,7 +30,9 @@ def main():
         sys.exit(1)
 
     try:
-        storyteller = LLMStoryTeller(api_key=api_key, model="gpt-4o-mini")
+        # stream=True renders combat and encounter narrations token by
+        # token, hiding most of the generation latency behind reading
+        storyteller = LLMStoryTeller(api_key=api_key, model="gpt-4o-mini", stream=True)
         game_system = GameEngine(storyteller)
 
         # Start the game with Rich UI
@@ -7,7 +7,9 @@ are used across multiple modules in the game.
 from __future__ import annotations
 
 import random
-from typing import List, Protocol, Any
+from bisect import bisect
+from itertools import accumulate
+from typing import List, Protocol, Any, Tuple
 
 from models import WeightedOption
 
@@ -38,6 +40,61 @@ class DefaultRandomProvider:
         return random.choice(seq)
 
 
+def build_cumulative_weights(options: List[WeightedOption]) -> Tuple[Tuple[str, ...], Tuple[float, ...]]:
+    """Precompute a cumulative-weights table from a list of weighted options.
+
+    Use this when the same weighted distribution is sampled repeatedly:
+    build the table once, then draw with select_from_cumulative. This avoids
+    re-allocating option objects and re-summing weights on every draw.
+
+    Args:
+        options: List of WeightedOption instances. Weight must be >= 0.
+
+    Returns:
+        A (labels, cumulative_weights) pair of parallel tuples suitable for
+        select_from_cumulative.
+
+    OO rationale: Companion to select_weighted_random for hot paths; keeps
+    the weighted-selection logic centralized while letting callers cache the
+    immutable table.
+    """
+    if not options:
+        raise ValueError("Cannot build cumulative weights from empty options list")
+    labels = tuple(option.label for option in options)
+    cumulative_weights = tuple(accumulate(option.weight for option in options))
+    return labels, cumulative_weights
+
+
+def select_from_cumulative(
+    labels: Tuple[str, ...],
+    cumulative_weights: Tuple[float, ...],
+    random_provider: RandomProvider,
+) -> str:
+    """Select a label from a precomputed cumulative-weights table.
+
+    Uses binary search over the cumulative distribution, so each draw is
+    O(log n) with zero allocations.
+
+    Args:
+        labels: Labels tuple from build_cumulative_weights.
+        cumulative_weights: Matching cumulative weights tuple.
+        random_provider: Random number generator (for testability).
+
+    Returns:
+        The selected label. If the total weight is <= 0, returns the last
+        label as a fallback (mirroring select_weighted_random).
+    """
+    total_weight = cumulative_weights[-1]
+    if total_weight <= 0:
+        return labels[-1]
+    random_value = random_provider.random() * total_weight
+    index = bisect(cumulative_weights, random_value)
+    # Guard against floating point landing exactly on the total
+    if index >= len(labels):
+        index = len(labels) - 1
+    return labels[index]
+
+
 def select_weighted_random(options: List[WeightedOption], random_provider: RandomProvider) -> str:
     """Select a random option from weighted choices using probability distribution.
 